@@ -55,6 +55,10 @@ class ConfigReader:
         self.realms: Dict[str, Realm] = {}
         # Top-level named volumes (normalized)
         self.volumes: Dict[str, Dict[str, Any]] = {}
+        # Effective definitions already merged, keyed by
+        # (service, realm, profile, variety); the parsed config never
+        # changes for the life of a reader
+        self._effective_defs: Dict[tuple, EffectiveServiceDefinition] = {}
 
         # Load and parse configuration
         self._load_config()
@@ -728,20 +732,37 @@ class ConfigReader:
     ) -> EffectiveServiceDefinition:
         """Get the effective service definition by merging base, variety, and
         profile fields.
+
+        Lookups by service name are memoized, so every caller asking for the
+        same (service, realm, profile, variety) shares one definition. It
+        must not be mutated; copy any field that needs changing.
         """
         if isinstance(service, str):
             if realm is None:
                 raise ValueError(
                     f"realm is required when service is a string: {service}",
                 )
-            sd = self.get_service_by_name(service, realm)
-            if not sd:
-                raise ValueError(
-                    f"Service definition not found: {service} in realm {realm}",
-                )
-        else:
-            sd = service
+            key = (service, realm, profile, variety)
+            eff_def = self._effective_defs.get(key)
+            if eff_def is None:
+                sd = self.get_service_by_name(service, realm)
+                if not sd:
+                    raise ValueError(
+                        "Service definition not found: "
+                        f"{service} in realm {realm}",
+                    )
+                eff_def = self._merge_effective_definition(sd, profile, variety)
+                self._effective_defs[key] = eff_def
+            return eff_def
+        return self._merge_effective_definition(service, profile, variety)
 
+    def _merge_effective_definition(
+        self,
+        sd: ServiceDefinition,
+        profile: str | None,
+        variety: str | None,
+    ) -> EffectiveServiceDefinition:
+        """Merge the base, variety, and profile fields of `sd`."""
         base_env = sd.environment or {}
         base_props = sd.properties or {}
         base_depends_on = sd.depends_on or []
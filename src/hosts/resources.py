@@ -1,4 +1,6 @@
 import subprocess
+import threading
+from typing import List, Optional
 
 import psutil
 from pydantic import BaseModel, Field
@@ -21,6 +23,12 @@ except (ImportError, AttributeError):
 
 logger = get_logger()
 
+# NVML is initialized once per process. Device handles, names and PCI
+# descriptions do not change while the driver is loaded, so they are read
+# once too; only memory usage is sampled on every inspection.
+_nvml_lock = threading.Lock()
+_nvml_devices: Optional[List[tuple]] = None
+
 
 class GPUResource(BaseModel):
     """Pydantic model representing GPU resource information."""
@@ -182,15 +190,14 @@ class HostResources(BaseModel):
         if not NVIDIA_AVAILABLE:
             return [], 0.0, 0.0
 
+        global _nvml_devices
         try:
-            pynvml.nvmlInit()
-            device_count = pynvml.nvmlDeviceGetCount()
+            devices = HostResources._nvidia_devices()
             gpus = []
             total_vram = 0.0
             available_vram = 0.0
 
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            for i, (handle, name, pci_desc) in enumerate(devices):
                 mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
 
                 total_mb = mem_info.total / (1024**2)
@@ -198,26 +205,6 @@ class HostResources(BaseModel):
                 used_mb = mem_info.used / (1024**2)
                 util = used_mb / total_mb if total_mb > 0 else 0
 
-                # Get GPU name/description
-                try:
-                    name = pynvml.nvmlDeviceGetName(handle)
-                    if isinstance(name, bytes):
-                        name = name.decode("utf-8")
-                except Exception:
-                    name = f"NVIDIA GPU {i}"
-
-                # Get PCI info
-                try:
-                    pci_info = pynvml.nvmlDeviceGetPciInfo(handle)
-                    bus_id = (
-                        pci_info.busId.decode("utf-8")
-                        if isinstance(pci_info.busId, bytes)
-                        else pci_info.busId
-                    )
-                    pci_desc = f"{bus_id}"
-                except Exception:
-                    pci_desc = f"PCI:{i:02x}:00.0"
-
                 gpus.append({
                     "id": i,
                     "total_vram_mb": total_mb,
@@ -233,11 +220,79 @@ class HostResources(BaseModel):
                 total_vram += total_mb
                 available_vram += free_mb
 
-            pynvml.nvmlShutdown()
             return gpus, total_vram / 1024, available_vram / 1024
         except Exception:
+            # Start over with a fresh NVML session next time, e.g. after
+            # a driver reload
+            with _nvml_lock:
+                if _nvml_devices is not None:
+                    _nvml_devices = None
+                    HostResources._nvml_shutdown()
             return [], 0.0, 0.0
 
+    @staticmethod
+    def _nvml_shutdown() -> None:
+        """End the NVML session, ignoring errors from a driver that is
+        already gone.
+        """
+        try:
+            pynvml.nvmlShutdown()
+        except Exception as e:
+            logger.debug("nvmlShutdown failed: %s", e)
+
+    @staticmethod
+    def _nvidia_devices() -> List[tuple]:
+        """Initialize NVML on first use and return (handle, name, PCI
+        description) for each NVIDIA device.
+        """
+        global _nvml_devices
+        with _nvml_lock:
+            if _nvml_devices is not None:
+                return _nvml_devices
+
+            pynvml.nvmlInit()
+            try:
+                devices = HostResources._enumerate_nvidia_devices()
+            except Exception:
+                HostResources._nvml_shutdown()
+                raise
+
+            _nvml_devices = devices
+            return devices
+
+    @staticmethod
+    def _enumerate_nvidia_devices() -> List[tuple]:
+        """Read (handle, name, PCI description) for each NVIDIA device
+        from an initialized NVML session.
+        """
+        devices = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+
+            # Get GPU name/description
+            try:
+                name = pynvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8")
+            except Exception:
+                name = f"NVIDIA GPU {i}"
+
+            # Get PCI info
+            try:
+                pci_info = pynvml.nvmlDeviceGetPciInfo(handle)
+                bus_id = (
+                    pci_info.busId.decode("utf-8")
+                    if isinstance(pci_info.busId, bytes)
+                    else pci_info.busId
+                )
+                pci_desc = f"{bus_id}"
+            except Exception:
+                pci_desc = f"PCI:{i:02x}:00.0"
+
+            devices.append((handle, name, pci_desc))
+
+        return devices
+
     @staticmethod
     def _get_amd_gpu_info() -> tuple[list[dict], float, float]:
         """Get AMD GPU information using amdsmi.
@@ -1,12 +1,30 @@
+import bisect
+import ctypes
+import errno
 import itertools
 import os
 import pathlib
+import random
 import shutil
 import signal
+import socket
 import subprocess
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Iterable, List, Optional, Type
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 
 import yaml
 from dotenv import load_dotenv
@@ -15,6 +33,7 @@ from config.reader import SystemConfigReader
 from hosts.resources import HostResources
 from orchestration.service import BaseProvisionableService
 from util.active_services_cache import ActiveServicesCache, WriteCollision
+from util.cache_updates import CacheUpdateSubscriber
 from util.footprint_request_cache import FootprintRequestCache
 from util.logger import get_logger
 from util.secrets_store import SecretsStore
@@ -33,14 +52,235 @@ from .models import (
     VolumeDefinition,
 )
 
+# libyaml-backed safe loader/dumper where PyYAML was built with it
+try:
+    from yaml import (
+        CSafeDumper as _YamlDumper,
+        CSafeLoader as _YamlLoader,
+    )
+except ImportError:
+    from yaml import (
+        SafeDumper as _YamlDumper,
+        SafeLoader as _YamlLoader,
+    )
+
 BACKEND_DAEMON_SLEEP_TIME = 2.0
 SERVICE_START_TIMEOUT = 3600.0
 SERVICE_STOP_TIMEOUT = 3600.0
+# Fraction by which the start/stop timeouts vary between services
+TIMEOUT_JITTER = 0.1
+SERVICE_MARKER_POLL_INTERVAL = 0.5
+MOUNT_TABLE_TTL = 0.5
+NFS_MOUNT_MAX_WORKERS = 16
+# Applied to every NFS mount; per-volume "options" override these
+NFS_DEFAULT_MOUNT_OPTIONS = (
+    "actimeo=600,nocto,rsize=1048576,wsize=1048576,nconnect=8,"
+    "lookupcache=pos,noresvport,hard,timeo=600,retrans=2"
+)
+_NFS_EXCLUSIVE_FLAGS = {"hard": ("soft",), "soft": ("hard",)}
+# Backoff for retrying cache writes that hit a WriteCollision
+WRITE_RETRY_INITIAL_DELAY = 0.01
+WRITE_RETRY_MAX_DELAY = 0.2
+WRITE_RETRY_MAX_ATTEMPTS = 50
+
+MNT_DETACH = 2
+# Statuses the backend tick acts on
+_TRANSITIONAL_STATUSES = frozenset((
+    ServiceStatus.STARTING,
+    ServiceStatus.STOPPING,
+))
 
 logger = get_logger()
 load_dotenv()
 
+
+def _backoff_delays(
+    initial: float = WRITE_RETRY_INITIAL_DELAY,
+    cap: float = WRITE_RETRY_MAX_DELAY,
+) -> Iterator[float]:
+    """Yield exponentially growing retry delays, each scaled by a random
+    factor in [0.5, 1) so competing writers do not retry in lockstep.
+    """
+    delay = initial
+    while True:
+        yield delay * (0.5 + random.random() * 0.5)
+        delay = min(delay * 2, cap)
+
+
+def _jittered_timeout(timeout: float, name: str) -> float:
+    """Spread `timeout` over +/- TIMEOUT_JITTER of its value, stably per
+    `name` (across processes too), so services initiated together do not
+    all time out and get re-initiated at the same moment.
+    """
+    spread = zlib.crc32(name.encode()) / 0xFFFFFFFF
+    return timeout * (1 - TIMEOUT_JITTER + 2 * TIMEOUT_JITTER * spread)
+
+
+def _usage_sort_key(key: tuple) -> tuple:
+    """Order (service_name, profile, variety) footprint keys, sorting a
+    missing profile or variety first.
+    """
+    service_name, profile, variety = key
+    return service_name, profile or "", variety or ""
+
+
+def _load_libc_function(name: str, argtypes: list):
+    """Bind `name` from the C library, or return None where it is not
+    available (non-Linux hosts), in which case the equivalent binary is
+    spawned instead.
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        func = getattr(libc, name)
+    except (AttributeError, OSError):
+        return None
+    func.argtypes = argtypes
+    func.restype = ctypes.c_int
+    return func
+
+
+_umount2 = _load_libc_function("umount2", [ctypes.c_char_p, ctypes.c_int])
+_mount = _load_libc_function(
+    "mount",
+    [
+        ctypes.c_char_p,
+        ctypes.c_char_p,
+        ctypes.c_char_p,
+        ctypes.c_ulong,
+        ctypes.c_char_p,
+    ],
+)
+
+
+def _lazy_unmount(path: str) -> int:
+    """Lazily unmount `path` (umount -l) and return 0 or the errno."""
+    if _umount2 is None:
+        result = subprocess.run(
+            ["umount", "-l", path],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            return 0
+        # Map umount(8)'s messages onto what umount2(2) would have returned
+        stderr = result.stderr.lower()
+        if "not mounted" in stderr:
+            return errno.EINVAL
+        if "no such file or directory" in stderr:
+            return errno.ENOENT
+        return errno.EIO
+    if _umount2(os.fsencode(path), MNT_DETACH) == 0:
+        return 0
+    return ctypes.get_errno()
+
+
+def _mount_nfs(
+    server: str, path: str, mountpoint: str, opts: str
+) -> Optional[str]:
+    """Mount `server:path` on `mountpoint`; return None, or an error message.
+
+    The kernel NFS client is asked directly via mount(2), which needs the
+    server address passed as "addr=". mount(8) and its mount.nfs helper
+    are only spawned where mount(2) is unavailable or fails: the helper
+    knows how to complete options the kernel rejects, and reports failures
+    in more detail. EBUSY (something is already mounted there) is returned
+    as is.
+    """
+    src = f"{server}:{path}"
+    if _mount is not None:
+        try:
+            addr = socket.getaddrinfo(server, None)[0][4][0]
+        except OSError as e:
+            return f"cannot resolve {server}: {e}"
+        data = f"addr={addr},{opts}" if opts else f"addr={addr}"
+        rc = _mount(
+            os.fsencode(src), os.fsencode(mountpoint), b"nfs", 0, data.encode()
+        )
+        if rc == 0:
+            return None
+        err = ctypes.get_errno()
+        if err == errno.EBUSY:
+            return os.strerror(err)
+
+    result = subprocess.run(
+        ["mount", "-t", "nfs", "-o", opts, src, mountpoint],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return result.stderr or result.stdout
+    return None
+
+
 _system_provisioner = None
+_system_provisioner_lock = threading.RLock()
+
+
+class _MountCache:
+    """Sorted list of current mountpoints read from /proc/self/mounts.
+
+    Keeping the list sorted lets lookups bisect, and makes the mountpoints
+    below a directory one contiguous slice of the list.
+
+    The table is re-read at most every MOUNT_TABLE_TTL seconds, or on the
+    next lookup after invalidate() is called following a mount/umount.
+    """
+
+    MOUNTS_FILE = "/proc/self/mounts"
+
+    def __init__(self, ttl: float = MOUNT_TABLE_TTL):
+        self._ttl = ttl
+        self._mountpoints: List[str] = []
+        self._loaded_at: Optional[float] = None
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def mountpoints(self) -> List[str]:
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self._ttl:
+            self._mountpoints = self._read_mount_table()
+            self._loaded_at = now
+        return self._mountpoints
+
+    def is_mountpoint(self, path: str) -> bool:
+        mountpoints = self.mountpoints()
+        i = bisect.bisect_left(mountpoints, path)
+        return i < len(mountpoints) and mountpoints[i] == path
+
+    def mountpoints_under(self, root: str) -> List[str]:
+        """Return the mountpoints below root, deepest first."""
+        mountpoints = self.mountpoints()
+        prefix = os.path.join(root, "")
+        start = i = bisect.bisect_left(mountpoints, prefix)
+        while i < len(mountpoints) and mountpoints[i].startswith(prefix):
+            i += 1
+        # Children sort after their parents, so reversing the slice
+        # unmounts nested mounts first
+        return mountpoints[start:i][::-1]
+
+    @classmethod
+    def _read_mount_table(cls) -> List[str]:
+        fd = os.open(cls.MOUNTS_FILE, os.O_RDONLY)
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            os.close(fd)
+
+        # Each line is "<source> <mountpoint> <fstype> <options> ..."
+        mountpoints = set()
+        for line in b"".join(chunks).split(b"\n"):
+            fields = line.split(b" ", 2)
+            if len(fields) > 1:
+                mountpoints.add(os.fsdecode(fields[1]))
+        return sorted(mountpoints)
 
 
 class SystemProvisioner:
@@ -61,6 +301,26 @@ class SystemProvisioner:
         )
         self._secrets_store = SecretsStore(cache) if cache else None
         self._provisioned_networks: List[NetworkInstance] = []
+        # Set by the signal handler; waits on it return early on shutdown
+        self._stop_event = threading.Event()
+        # Set when a cache write (or shutdown) means the daemon loop has
+        # work to do; BACKEND_DAEMON_SLEEP_TIME only bounds the wait
+        self._wake_event = threading.Event()
+        self._mount_cache = _MountCache()
+        # Memoized config lookups; the config reader parses its file once,
+        # so these never go stale. Effective definitions are memoized by
+        # the config reader itself.
+        self._realm_volume_index: Dict[str, Dict[str, VolumeDefinition]] = {}
+        self._service_classes: Dict[
+            tuple, Optional[Type[BaseProvisionableService]]
+        ] = {}
+        # Footprint usage records, indexed once per footprint data file
+        self._footprint_usage: Optional[Dict[tuple, dict]] = None
+        self._footprint_usage_source: Optional[tuple] = None
+        # Set by _footprint_usage_batch() to defer writes of the index;
+        # only the daemon thread footprints, so this needs no lock
+        self._footprint_usage_batch_depth = 0
+        self._footprint_usage_unsaved: Optional[str] = None
 
         # Find our own provisioner definition to get encrypted_storage_dir
         self.encrypted_storage_dir = None
@@ -73,13 +333,25 @@ class SystemProvisioner:
                     )
                     break
 
+    @property
+    def encrypted_storage_dir(self) -> Optional[str]:
+        return self._encrypted_storage_dir
+
+    @encrypted_storage_dir.setter
+    def encrypted_storage_dir(self, value: Optional[str]) -> None:
+        # The storage root is used to build every volume path; keep a Path
+        # for it instead of rebuilding one per call
+        self._encrypted_storage_dir = value
+        self._storage_root = pathlib.Path(value) if value else None
+
     def get_cache(self) -> Cache:
         return self._cache
 
     @staticmethod
     def _init_cache() -> Cache:
-        provisioner_cache = None
         config_reader = SystemConfigReader.singleton()
+        # Index once by name; the first definition of a name wins
+        provisioners = {p.name: p for p in reversed(config_reader.provisioners)}
         configured_provisioner_name = os.environ.get(
             "OZWALD_PROVISIONER",
         )
@@ -90,10 +362,8 @@ class SystemProvisioner:
             else:
                 configured_provisioner_name = "unconfigured"
 
-        for provisioner in config_reader.provisioners:
-            if provisioner.name == configured_provisioner_name:
-                provisioner_cache = provisioner.cache
-                break
+        provisioner = provisioners.get(configured_provisioner_name)
+        provisioner_cache = provisioner.cache if provisioner else None
 
         if not provisioner_cache:
             # If we still don't have a cache, and there are
@@ -110,19 +380,29 @@ class SystemProvisioner:
     @classmethod
     def singleton(cls, cache: Optional[Cache] = None):
         global _system_provisioner
-        if not _system_provisioner:
+        if _system_provisioner:
+            return _system_provisioner
+        with _system_provisioner_lock:
+            # Double-check: another thread may have built it while we
+            # waited for the lock
+            if _system_provisioner:
+                return _system_provisioner
+
             config_reader = SystemConfigReader.singleton()
             provisioner_cache = cache or cls._init_cache()
 
-            _system_provisioner = cls(
+            provisioner = cls(
                 config_reader=config_reader,
                 cache=provisioner_cache,
             )
             # Prepare NFS mounts defined at top-level volumes before use
             try:
-                _system_provisioner._prepare_nfs_mounts()
+                provisioner._prepare_nfs_mounts()
             except Exception as e:
                 logger.error("Failed to prepare NFS mounts: %s", e)
+            # Publish only once fully initialized, so the lock-free fast
+            # path never sees a provisioner whose mounts are not ready
+            _system_provisioner = provisioner
         return _system_provisioner
 
     def set_secret(self, realm: str, locker: str, encrypted_blob: str) -> None:
@@ -145,12 +425,14 @@ class SystemProvisioner:
         persistent: Optional[bool] = None,
     ) -> List[ServiceInformation]:
         """Get all currently active services"""
-        if self._active_services_cache:
-            services = self._active_services_cache.get_services()
-            if persistent is None:
-                return services
-            return [s for s in services if s.persistent == persistent]
-        return []
+        if not self._active_services_cache:
+            return []
+        services = self._active_services_cache.get_services()
+        # get_services() already builds a fresh list, so the unfiltered case
+        # hands it back as-is rather than copying it
+        if persistent is None:
+            return services
+        return [s for s in services if s.persistent == persistent]
 
     def update_active_services(
         self,
@@ -185,11 +467,46 @@ class SystemProvisioner:
                         "persistent=False"
                     )
 
-        # Get current active services from cache
-        active_service_info_objects = self._active_services_cache.get_services()
+        # Read-modify-write against a snapshot; the write only lands if no
+        # other write happened in between, otherwise re-read and re-apply
+        cache = self._active_services_cache
+        deadline = time.monotonic() + 2.0
+        delays = _backoff_delays()
+        for _ in range(WRITE_RETRY_MAX_ATTEMPTS):
+            version, active_service_info_objects = cache.get_snapshot()
+            self._apply_service_updates(
+                active_service_info_objects, service_updates, persistent
+            )
+            try:
+                cache.compare_and_set_services(
+                    version, active_service_info_objects
+                )
+                # Let a daemon loop in this process pick the change up now
+                self._wake_event.set()
+                return True
+            except WriteCollision:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(next(delays))
+
+        logger.error(
+            "Failed to update services: timeout after 2 seconds "
+            "due to write collisions",
+        )
+        return False
 
+    def _apply_service_updates(
+        self,
+        active_service_info_objects: List[ServiceInformation],
+        service_updates: List[ServiceInformation],
+        persistent: Optional[bool],
+    ) -> None:
+        """Apply requested services to a snapshot of the active services,
+        in place: mark services no longer requested (within the
+        persistence scope) STOPPING and add or update the requested ones.
+        """
         # Create a set of requested service names
-        requested_services = {si.name for si in service_updates}
+        requested_services = frozenset(si.name for si in service_updates)
 
         # Stop services if they're not in the requested list and within
         # the persistence scope
@@ -216,15 +533,13 @@ class SystemProvisioner:
             svc.status = ServiceStatus.STOPPING
 
         # Add or update services
+        # Reversed so that, as with a linear scan, the first entry for a
+        # name wins
+        active_by_name = {
+            s.name: s for s in reversed(active_service_info_objects)
+        }
         for service_info in service_updates:
-            existing = next(
-                (
-                    s
-                    for s in active_service_info_objects
-                    if s.name == service_info.name
-                ),
-                None,
-            )
+            existing = active_by_name.get(service_info.name)
 
             if existing:
                 # Update existing service if needed
@@ -243,23 +558,7 @@ class SystemProvisioner:
                 new_service = self._init_service(service_info)
                 if new_service:
                     active_service_info_objects.append(new_service)
-
-        # Save updated services to cache with retry logic
-        start_time = time.time()
-        while time.time() - start_time < 2.0:
-            try:
-                self._active_services_cache.set_services(
-                    active_service_info_objects,
-                )
-                return True
-            except WriteCollision:
-                time.sleep(0.2)
-
-        logger.error(
-            "Failed to update services: timeout after 2 seconds "
-            "due to write collisions",
-        )
-        return False
+                    active_by_name[new_service.name] = new_service
 
     def get_available_resources(self) -> List[Resource]:
         """Get currently available resources on this host"""
@@ -293,6 +592,21 @@ class SystemProvisioner:
 
         # VRAM resource
         if host_resources.total_gpus > 0:
+            # One pass over the GPUs feeds both the VRAM details and the
+            # per-GPU resources
+            available_gpus = frozenset(host_resources.available_gpus)
+            total_vram = host_resources.gpuid_to_total_vram
+            available_vram = host_resources.gpuid_to_available_vram
+            gpu_rows = [
+                (
+                    gpu_id,
+                    total_vram.get(gpu_id, 0),
+                    available_vram.get(gpu_id, 0),
+                    1.0 if gpu_id in available_gpus else 0.0,
+                )
+                for gpu_id in range(host_resources.total_gpus)
+            ]
+
             resources.append(
                 Resource(
                     name="vram",
@@ -304,47 +618,31 @@ class SystemProvisioner:
                         "total": host_resources.total_vram_gb,
                         "gpu_details": {
                             str(gpu_id): {
-                                "total": host_resources.gpuid_to_total_vram.get(
-                                    gpu_id,
-                                    0,
-                                ),
-                                "available": (
-                                    host_resources.gpuid_to_available_vram.get(
-                                        gpu_id,
-                                        0,
-                                    )
-                                ),
+                                "total": vram_total,
+                                "available": vram_avail,
                             }
-                            for gpu_id in range(host_resources.total_gpus)
+                            for gpu_id, vram_total, vram_avail, _ in gpu_rows
                         },
                     },
                 ),
             )
 
             # GPU resource
-            for gpu_id in range(host_resources.total_gpus):
-                vram_total = host_resources.gpuid_to_total_vram.get(gpu_id, 0)
-                vram_avail = host_resources.gpuid_to_available_vram.get(
-                    gpu_id,
-                    0,
-                )
-                is_available = (
-                    1.0 if gpu_id in host_resources.available_gpus else 0.0
-                )
-                resources.append(
-                    Resource(
-                        name=f"gpu_{gpu_id}",
-                        type="gpu",
-                        unit="device",
-                        value=is_available,
-                        related_resources=["vram"],
-                        extended_attributes={
-                            "gpu_id": gpu_id,
-                            "vram_total": vram_total,
-                            "vram_available": vram_avail,
-                        },
-                    ),
+            resources.extend(
+                Resource(
+                    name=f"gpu_{gpu_id}",
+                    type="gpu",
+                    unit="device",
+                    value=is_available,
+                    related_resources=["vram"],
+                    extended_attributes={
+                        "gpu_id": gpu_id,
+                        "vram_total": vram_total,
+                        "vram_available": vram_avail,
+                    },
                 )
+                for gpu_id, vram_total, vram_avail, is_available in gpu_rows
+            )
 
         return resources
 
@@ -370,32 +668,33 @@ class SystemProvisioner:
 
     @staticmethod
     def _validate_footprint_data_file_is_writable() -> bool:
-        footprint_path_str = os.environ.get("OZWALD_FOOTPRINT_DATA")
-        footprint_path = pathlib.Path(footprint_path_str)
-        if footprint_path.exists():
-            if not os.access(footprint_path, os.W_OK):
-                logger.error(
-                    f"Footprint data file '{footprint_path}' is not writable; "
-                    "backend daemon cannot run"
-                )
-                return False
-        else:
-            parent = footprint_path.parent
-            if not parent.exists():
-                logger.error(
-                    f"Parent directory '{parent}' for "
-                    f"footprint data: {footprint_path} does not exist;"
-                    "backend daemon cannot run"
-                )
-                return False
-            if not os.access(parent, os.W_OK):
-                logger.error(
-                    f"Footprint data directory '{parent}' is not writable; "
-                    "backend daemon cannot run"
-                )
-                return False
+        footprint_path = os.environ.get("OZWALD_FOOTPRINT_DATA")
+        # One access() call settles the usual case of an existing, writable
+        # file; the failure cases are told apart only when it fails
+        if os.access(footprint_path, os.W_OK):
+            return True
+        if os.path.exists(footprint_path):
+            logger.error(
+                f"Footprint data file '{footprint_path}' is not writable; "
+                "backend daemon cannot run"
+            )
+            return False
 
-        return True
+        parent = os.path.dirname(footprint_path) or "."
+        if os.access(parent, os.W_OK):
+            return True
+        if not os.path.exists(parent):
+            logger.error(
+                f"Parent directory '{parent}' for "
+                f"footprint data: {footprint_path} does not exist;"
+                "backend daemon cannot run"
+            )
+        else:
+            logger.error(
+                f"Footprint data directory '{parent}' is not writable; "
+                "backend daemon cannot run"
+            )
+        return False
 
     def _init_services(self) -> None:
         """Call init_service class method for each service class."""
@@ -415,17 +714,33 @@ class SystemProvisioner:
 
     def _get_service_class_from_service_info(
         self, svc_info: ServiceInformation
+    ) -> Optional[Type["BaseProvisionableService"]]:
+        return self._get_service_class(svc_info.service, svc_info.realm)
+
+    def _get_service_class(
+        self, service_name: str, realm: str
+    ) -> Optional[Type["BaseProvisionableService"]]:
+        key = (service_name, realm)
+        if key not in self._service_classes:
+            self._service_classes[key] = self._resolve_service_class(
+                service_name, realm
+            )
+        return self._service_classes[key]
+
+    def _resolve_service_class(
+        self, service_name: str, realm: str
     ) -> Optional[Type["BaseProvisionableService"]]:
         # Resolve the service definition to get the concrete
         # service type
         service_def = self.config_reader.get_service_by_name(
-            svc_info.service,
-            svc_info.realm,
+            service_name,
+            realm,
         )
         if not service_def:
             logger.error(
-                (f"Service definition '{svc_info.service}' not ")
-                + (f"found for active service '{svc_info.name}'"),
+                "Service definition '%s' not found in realm '%s'",
+                service_name,
+                realm,
             )
             return None
 
@@ -440,26 +755,44 @@ class SystemProvisioner:
             service_type_str,
         )
 
+    @staticmethod
+    def _initiated_within(
+        info: dict, key: str, now: datetime, timeout: float
+    ) -> bool:
+        """Whether `info[key]` records an initiation less than `timeout`
+        seconds before `now`.
+
+        Compares the epoch stamp stored next to the ISO string; entries
+        written before the stamp existed fall back to parsing the string.
+        """
+        initiated = info.get(f"{key}_epoch")
+        if initiated is None:
+            initiated_iso = info.get(key)
+            if not initiated_iso:
+                return False
+            initiated = datetime.fromisoformat(initiated_iso).timestamp()
+        return now.timestamp() - initiated < timeout
+
     def _start_service(
         self,
         svc_info: ServiceInformation,
         service_cls: Type["BaseProvisionableService"],
         now: datetime,
+        reverify: bool = True,
     ) -> bool:
         updated = False
 
         # Re-verify status and initiation from the most current cache state
         # to avoid race conditions with background threads or other
-        # provisioner instances.
-        current_active = self._active_services_cache.get_services()
-        latest_info = next(
-            (s for s in current_active if s.name == svc_info.name), None
-        )
+        # provisioner instances. Callers that took svc_info from a snapshot
+        # they are about to write back in full pass reverify=False; a
+        # re-read would gain them nothing.
+        latest_info = self._latest_service_info(svc_info.name, reverify)
         if latest_info:
             if latest_info.status == ServiceStatus.AVAILABLE:
                 logger.info(
-                    f"Service {svc_info.name} is already AVAILABLE, "
-                    "skipping start"
+                    "Service %s is already AVAILABLE, skipping start",
+                    svc_info.name,
                 )
                 return False
             # Update our local info with latest from cache to get the
@@ -467,26 +800,26 @@ class SystemProvisioner:
             if latest_info.info:
                 svc_info.info.update(latest_info.info)
 
-        logger.info(f"service {svc_info.name}[{svc_info.service}] is starting")
+        logger.info(
+            "service %s[%s] is starting", svc_info.name, svc_info.service
+        )
         # Check duplicate initiation within timeout
-        start_initiated_iso = svc_info.info.get(
+        if self._initiated_within(
+            svc_info.info,
             "start_initiated",
-        )
-        if start_initiated_iso:
-            started_when = datetime.fromisoformat(
-                start_initiated_iso,
+            now,
+            _jittered_timeout(SERVICE_START_TIMEOUT, svc_info.name),
+        ):
+            logger.info(
+                (
+                    "Duplicate start request "
+                    "ignored for service '%s': "
+                    "start already initiated at %s"
+                ),
+                svc_info.name,
+                svc_info.info.get("start_initiated"),
             )
-            if (now - started_when).total_seconds() < SERVICE_START_TIMEOUT:
-                logger.info(
-                    (
-                        "Duplicate start request "
-                        "ignored for service '%s': "
-                        "start already initiated at %s"
-                    ),
-                    svc_info.name,
-                    start_initiated_iso,
-                )
-                return False
+            return False
 
         # Instantiate and start the service
         try:
@@ -504,15 +837,14 @@ class SystemProvisioner:
 
         # Record start initiation before starting
         svc_info.info["start_initiated"] = now.isoformat()
+        svc_info.info["start_initiated_epoch"] = now.timestamp()
         updated = True
 
         # Prepare and mount volumes
         self._prepare_service_volumes(svc_info)
 
         try:
-            logger.info(
-                f"starting service: {svc_info.name}",
-            )
+            logger.info("starting service: %s", svc_info.name)
             service_instance.start()
             # If start() returns without error, we consider it AVAILABLE
             svc_info.status = ServiceStatus.AVAILABLE
@@ -534,41 +866,39 @@ class SystemProvisioner:
         svc_info: ServiceInformation,
         service_cls: Type["BaseProvisionableService"],
         now: datetime,
+        reverify: bool = True,
     ) -> bool:
         updated = False
 
         # Re-verify status and initiation from the most current cache state
-        current_active = self._active_services_cache.get_services()
-        latest_info = next(
-            (s for s in current_active if s.name == svc_info.name), None
-        )
+        # (see _start_service)
+        latest_info = self._latest_service_info(svc_info.name, reverify)
         if latest_info:
             if latest_info.status is None:  # Service already removed
                 logger.info(
-                    f"Service {svc_info.name} is already removed, skipping stop"
+                    "Service %s is already removed, skipping stop",
+                    svc_info.name,
                 )
                 return False
             if latest_info.info:
                 svc_info.info.update(latest_info.info)
 
-        stop_initiated_iso = svc_info.info.get(
+        if self._initiated_within(
+            svc_info.info,
             "stop_initiated",
-        )
-        if stop_initiated_iso:
-            stopped_when = datetime.fromisoformat(
-                stop_initiated_iso,
+            now,
+            _jittered_timeout(SERVICE_STOP_TIMEOUT, svc_info.name),
+        ):
+            logger.info(
+                (
+                    "Duplicate stop request "
+                    "ignored for service '%s': "
+                    "stop already initiated at %s"
+                ),
+                svc_info.name,
+                svc_info.info.get("stop_initiated"),
             )
-            if (now - stopped_when).total_seconds() < SERVICE_STOP_TIMEOUT:
-                logger.info(
-                    (
-                        "Duplicate stop request "
-                        "ignored for service '%s': "
-                        "stop already initiated at %s"
-                    ),
-                    svc_info.name,
-                    stop_initiated_iso,
-                )
-                return False
+            return False
 
         # Instantiate and stop the service
         try:
@@ -585,6 +915,7 @@ class SystemProvisioner:
 
         # Record stop initiation prior to stopping
         svc_info.info["stop_initiated"] = now.isoformat()
+        svc_info.info["stop_initiated_epoch"] = now.timestamp()
         updated = True
 
         try:
@@ -619,6 +950,31 @@ class SystemProvisioner:
 
         return updated
 
+    def _latest_service_info(
+        self,
+        name: str,
+        reverify: bool,
+    ) -> Optional[ServiceInformation]:
+        """Re-read a service from the cache, or return None without
+        reading when the caller does not need it re-verified.
+        """
+        if not reverify:
+            return None
+        current_active = self._active_services_cache.get_services()
+        return next((s for s in current_active if s.name == name), None)
+
+    def _get_realm_volumes(
+        self,
+        realm_name: str,
+    ) -> Dict[str, VolumeDefinition]:
+        """Return the realm's volume definitions keyed by name."""
+        volumes = self._realm_volume_index.get(realm_name)
+        if volumes is None:
+            realm = self.config_reader.realms.get(realm_name)
+            volumes = {v.name: v for v in ((realm and realm.volumes) or [])}
+            self._realm_volume_index[realm_name] = volumes
+        return volumes
+
     def _handle_requests(self):
         # Load the current snapshot of active services
         active_services: List[ServiceInformation] = (
@@ -634,25 +990,25 @@ class SystemProvisioner:
                 logger.info("footprint requests found")
                 # Process one request at a time
                 self._handle_footprint_request(requests[0])
-                # After processing, loop again (do not sleep long)
-                time.sleep(0.2)
+                # After processing, loop again without waiting
+                self._wake_event.set()
                 return
 
-        if not active_services:
-            time.sleep(BACKEND_DAEMON_SLEEP_TIME)
+        # Nothing to do unless a service is starting or stopping
+        if not any(s.status in _TRANSITIONAL_STATUSES for s in active_services):
             return
 
         any_updated = False
         now = datetime.now()
+        # The whole tick works from this one snapshot (it is written back
+        # in full below), so the start/stop helpers do not re-read the
+        # cache for every service
 
         for idx, svc_info in enumerate(active_services):
-            logger.info("examining service: %s", svc_info)
+            logger.debug("examining service: %s", svc_info)
             try:
                 # Only act on services with STARTING or STOPPING status
-                if svc_info.status not in (
-                    ServiceStatus.STARTING,
-                    ServiceStatus.STOPPING,
-                ):
+                if svc_info.status not in _TRANSITIONAL_STATUSES:
                     continue
 
                 # lookup service class
@@ -662,8 +1018,9 @@ class SystemProvisioner:
                 if not service_cls:
                     logger.error(
                         "No provisionable service implementation found"
-                        f" for type '{svc_info.service}' "
-                        f"(service '{svc_info.name}')",
+                        " for type '%s' (service '%s')",
+                        svc_info.service,
+                        svc_info.name,
                     )
                     continue
 
@@ -679,10 +1036,14 @@ class SystemProvisioner:
                 # STARTING flow
                 if (
                     svc_info.status == ServiceStatus.STARTING
-                    and self._start_service(svc_info, service_cls, now)
+                    and self._start_service(
+                        svc_info, service_cls, now, reverify=False
+                    )
                 ) or (
                     svc_info.status == ServiceStatus.STOPPING
-                    and self._stop_service(svc_info, service_cls, now)
+                    and self._stop_service(
+                        svc_info, service_cls, now, reverify=False
+                    )
                 ):
                     any_updated = True
 
@@ -710,26 +1071,30 @@ class SystemProvisioner:
                 for s in active_services
                 if not (
                     s.status == ServiceStatus.STOPPING
-                    and getattr(s, "info", None)
-                    and s.info.get("stop_completed")
+                    and s.info
+                    and "stop_completed" in s.info
                 )
             ]
 
-            deadline = time.time() + 5.0
-            while True:
+            deadline = time.monotonic() + 5.0
+            delays = _backoff_delays(cap=0.5)
+            for attempt in range(1, WRITE_RETRY_MAX_ATTEMPTS + 1):
                 try:
                     self._active_services_cache.set_services(
                         active_services,
                     )
                     break
                 except (WriteCollision, RuntimeError) as e:
-                    if time.time() >= deadline:
+                    if (
+                        time.monotonic() >= deadline
+                        or attempt == WRITE_RETRY_MAX_ATTEMPTS
+                    ):
                         logger.error(
                             "Failed to persist active services: %s",
                             e,
                         )
                         break
-                    time.sleep(0.5)
+                    time.sleep(next(delays))
                 except Exception as e:
                     logger.error(
                         (
@@ -742,9 +1107,10 @@ class SystemProvisioner:
 
     def _init_persistent_services(self) -> None:
         """Start all persistent services defined in the configuration."""
-        service_updates = []
-        for ps_decl in self.config_reader.persistent_services:
-            si = ServiceInformation(
+        # Declarations were validated when the configuration was loaded, so
+        # build the ServiceInformation objects without re-validating them.
+        service_updates = [
+            ServiceInformation.model_construct(
                 name=ps_decl.name,
                 service=ps_decl.service,
                 realm=ps_decl.realm,
@@ -752,7 +1118,8 @@ class SystemProvisioner:
                 profile=ps_decl.profile,
                 persistent=True,
             )
-            service_updates.append(si)
+            for ps_decl in self.config_reader.persistent_services
+        ]
 
         if service_updates:
             logger.info(
@@ -763,13 +1130,15 @@ class SystemProvisioner:
     def _shutdown_persistent_services(self) -> None:
         """Gracefully shutdown all persistent services."""
         logger.info("Shutting down persistent services...")
+        # A further signal received while we wait aborts the shutdown wait
+        self._stop_event.clear()
         # Request all persistent services to stop
         self.update_active_services([], persistent=True)
 
         # Wait for them to stop
-        start_time = time.time()
+        start_time = time.monotonic()
         timeout = 60.0
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
             persistent_services = self.get_active_services(persistent=True)
             if not persistent_services:
                 logger.info("All persistent services have stopped.")
@@ -781,7 +1150,12 @@ class SystemProvisioner:
             except Exception as e:
                 logger.error("Error during persistent services shutdown: %s", e)
 
-            time.sleep(1.0)
+            if self._stop_event.wait(1.0):
+                logger.warning(
+                    "Shutdown interrupted while waiting for persistent "
+                    "services to stop."
+                )
+                return
 
         logger.warning(
             "Timeout reached while waiting for persistent services to stop."
@@ -796,7 +1170,9 @@ class SystemProvisioner:
     def run_backend_daemon(self):
         """Run the backend daemon
         - Loops until a termination signal is received
-        - Sleeps BACKEND_DAEMON_SLEEP_TIME seconds between iterations
+        - Waits between iterations until a cache write is announced, or at
+          most BACKEND_DAEMON_SLEEP_TIME seconds; a signal wakes the wait so
+          shutdown starts immediately
         - Processes active services: starting and stopping
         - Handles duplicate start/stop requests within timeout windows
         """
@@ -825,16 +1201,14 @@ class SystemProvisioner:
         self._init_persistent_services()
 
         # Graceful shutdown handling
-        running = True
-
         def _handle_signal(signum, frame):
-            nonlocal running
             logger.info(
                 "Provisioner backend received signal %s; "
                 "shutting down gracefully...",
                 signum,
             )
-            running = False
+            self._stop_event.set()
+            self._wake_event.set()
             self._deinit_services()
 
         try:
@@ -848,13 +1222,20 @@ class SystemProvisioner:
                 "without them",
             )
 
-        while running:
-            try:
-                self._handle_requests()
-            except Exception as e:
-                logger.error("Backend daemon loop encountered an error: %s", e)
+        updates = self._subscribe_cache_updates()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self._handle_requests()
+                except Exception as e:
+                    logger.error(
+                        "Backend daemon loop encountered an error: %s", e
+                    )
 
-            time.sleep(BACKEND_DAEMON_SLEEP_TIME)
+                self._wait_for_work(BACKEND_DAEMON_SLEEP_TIME)
+        finally:
+            if updates:
+                updates.stop()
 
         # Graceful shutdown of persistent services
         self._shutdown_persistent_services()
@@ -868,6 +1249,29 @@ class SystemProvisioner:
 
         logger.info("Provisioner backend daemon stopped.")
 
+    def _subscribe_cache_updates(self) -> Optional[CacheUpdateSubscriber]:
+        """Wake the daemon loop whenever a cache is written. Without a
+        subscription the loop falls back to polling.
+        """
+        try:
+            updates = CacheUpdateSubscriber(self._cache)
+            updates.start(lambda key: self._wake_event.set())
+        except Exception as e:
+            logger.warning(
+                "Cache update notifications unavailable, polling: %s", e
+            )
+            return None
+        return updates
+
+    def _wait_for_work(self, timeout: float) -> None:
+        """Block until woken by a cache update or shutdown, or until
+        `timeout` seconds have passed.
+        """
+        self._wake_event.wait(timeout)
+        # Anything written from here on is seen by the next pass or wakes
+        # the next wait
+        self._wake_event.clear()
+
     # ------------------------------------------------------------------
     # Storage preparation (NFS)
     # ------------------------------------------------------------------
@@ -890,35 +1294,80 @@ class SystemProvisioner:
 
         mount_root = os.environ.get("OZWALD_NFS_MOUNTS", "/exports")
         pathlib.Path(mount_root).mkdir(exist_ok=True, parents=True)
+        pending = []
         for name, spec in nfs_vols.items():
             server = spec.get("server")
             path = spec.get("path")
-            opts = spec.get("options")
+            opts = self._nfs_mount_options(spec.get("options"))
             mountpoint = os.path.join(mount_root, name)
-            pathlib.Path(mountpoint).mkdir(exist_ok=True, parents=True)
-            if self._is_mountpoint(mountpoint):
+            # Check the (cached) mount table rather than stat-ing the
+            # mountpoint: a stat of an existing hard NFS mount blocks if
+            # its server is unreachable
+            if self._mount_cache.is_mountpoint(mountpoint):
                 continue
-            # Build mount command
+            pathlib.Path(mountpoint).mkdir(exist_ok=True, parents=True)
+            pending.append((server, path, mountpoint, opts))
+
+        if not pending:
+            return
+
+        # Each mount blocks on a round-trip to its NFS server, so run them
+        # concurrently and report all failures together
+        workers = min(NFS_MOUNT_MAX_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(lambda args: _mount_nfs(*args), pending))
+        self._mount_cache.invalidate()
+
+        failures = []
+        for (server, path, mountpoint, _), error in zip(pending, errors):
             src = f"{server}:{path}"
-            cmd = ["mount", "-t", "nfs"]
-            if opts:
-                if isinstance(opts, dict):
-                    # dict to comma-separated k=v
-                    flat = ",".join(f"{k}={v}" for k, v in opts.items())
-                    cmd += ["-o", flat]
-                elif isinstance(opts, str):
-                    cmd += ["-o", opts]
-            cmd += [src, mountpoint]
-            result = subprocess.run(
-                cmd, check=False, capture_output=True, text=True
-            )
-            if result.returncode != 0:
-                raise RuntimeError(
-                    f"Failed to mount NFS {src} -> {mountpoint}: "
-                    f"{result.stderr or result.stdout}",
-                )
+            if error is not None:
+                failures.append(f"{src} -> {mountpoint}: {error}")
+                continue
             logger.info("Mounted NFS %s -> %s", src, mountpoint)
 
+        if failures:
+            raise RuntimeError(f"Failed to mount NFS {'; '.join(failures)}")
+
+    @staticmethod
+    def _parse_mount_options(opts: str) -> dict:
+        """Parse "k=v,flag" mount options; flags map to None."""
+        parsed = {}
+        for opt in opts.split(","):
+            opt = opt.strip()
+            if not opt:
+                continue
+            key, sep, value = opt.partition("=")
+            parsed[key] = value if sep else None
+        return parsed
+
+    @classmethod
+    def _nfs_mount_options(cls, opts) -> str:
+        """Merge per-volume NFS options (dict or string) over the defaults.
+
+        Volume options win. A flag also replaces its negated form
+        (``cto`` drops the default ``nocto``), and ``soft`` replaces
+        ``hard``.
+        """
+        merged = cls._parse_mount_options(NFS_DEFAULT_MOUNT_OPTIONS)
+        if isinstance(opts, dict):
+            overrides = {str(k): v for k, v in opts.items()}
+        elif isinstance(opts, str):
+            overrides = cls._parse_mount_options(opts)
+        else:
+            overrides = {}
+
+        for key in overrides:
+            base = key[2:] if key.startswith("no") else key
+            conflicts = (base, f"no{base}", *_NFS_EXCLUSIVE_FLAGS.get(key, ()))
+            for conflict in conflicts:
+                merged.pop(conflict, None)
+        merged.update(overrides)
+        return ",".join(
+            key if value is None else f"{key}={value}"
+            for key, value in merged.items()
+        )
+
     # ------------------------------------------------------------------
     # Encrypted Storage Management
     # ------------------------------------------------------------------
@@ -935,18 +1384,27 @@ class SystemProvisioner:
             # Mount the global encrypted volume
             self._mount_encrypted_volume(
                 pathlib.Path(storage_file),
-                pathlib.Path(self.encrypted_storage_dir),
+                self._storage_root,
                 system_key,
             )
 
         # Clear leftover temporary volumes
         self._clear_temporary_volumes()
 
-        # Ensure realm-specific directories exist
+        # Ensure realm-specific directories exist. A plain mkdir is tried
+        # first so that existing directories cost a single syscall; parents
+        # are only created when the realm root itself is missing.
+        storage_root = self.encrypted_storage_dir
         for realm_name in self.config_reader.realms:
-            realm_root = pathlib.Path(self.encrypted_storage_dir) / realm_name
-            (realm_root / "tmp").mkdir(exist_ok=True, parents=True)
-            (realm_root / "mounts").mkdir(exist_ok=True, parents=True)
+            realm_root = os.path.join(storage_root, realm_name)
+            for subdir in ("tmp", "mounts"):
+                path = os.path.join(realm_root, subdir)
+                try:
+                    os.mkdir(path)
+                except FileExistsError:
+                    pass
+                except FileNotFoundError:
+                    os.makedirs(path, exist_ok=True)
 
     def _deinit_storage(self) -> None:
         """Unmount the global encrypted storage root."""
@@ -955,43 +1413,51 @@ class SystemProvisioner:
 
         storage_file = os.environ.get("OZWALD_ENCRYPTED_VOLUME_FILE")
         if storage_file:
-            self._unmount_encrypted_volume(
-                pathlib.Path(self.encrypted_storage_dir)
-            )
+            self._unmount_encrypted_volume(self._storage_root)
 
     def _clear_temporary_volumes(self) -> None:
         """Safely unmount and remove stale temporary volumes."""
         if not self.encrypted_storage_dir:
             return
 
-        storage_root = pathlib.Path(self.encrypted_storage_dir)
-        if not storage_root.exists():
+        storage_root = self.encrypted_storage_dir
+        if not os.path.isdir(storage_root):
             return
 
-        for realm_dir in storage_root.iterdir():
-            if not realm_dir.is_dir():
-                continue
+        with os.scandir(storage_root) as entries:
+            realm_dirs = [
+                entry.path
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+            ]
 
-            tmp_root = realm_dir / "tmp"
-            if tmp_root.exists():
+        for realm_dir in realm_dirs:
+            tmp_root = os.path.join(realm_dir, "tmp")
+            if os.path.exists(tmp_root):
                 try:
                     # Unmount any sub-mounts if they exist (unlikely in tmp)
-                    for entry in tmp_root.rglob("*"):
-                        if entry.is_dir() and self._is_mountpoint(str(entry)):
-                            self._unmount_encrypted_volume(entry)
+                    for mnt in self._mountpoints_under(tmp_root):
+                        self._unmount_encrypted_volume(mnt)
                     shutil.rmtree(tmp_root)
                 except Exception as e:
                     logger.warning(
                         f"Failed to clear temporary root {tmp_root}: {e}"
                     )
-                tmp_root.mkdir(exist_ok=True)
+                os.makedirs(tmp_root, exist_ok=True)
 
-            mounts_root = realm_dir / "mounts"
-            if mounts_root.exists():
+            mounts_root = os.path.join(realm_dir, "mounts")
+            if os.path.exists(mounts_root):
                 # Unmount everything in mounts_root
-                for mnt in mounts_root.rglob("*"):
-                    if mnt.is_dir() and self._is_mountpoint(str(mnt)):
-                        self._unmount_encrypted_volume(mnt)
+                for mnt in self._mountpoints_under(mounts_root):
+                    self._unmount_encrypted_volume(mnt)
+
+    def _mountpoints_under(self, root: str) -> List[str]:
+        """Return the mountpoints below root, deepest first.
+
+        Reads the mount table instead of walking the directory tree and
+        probing every entry.
+        """
+        return self._mount_cache.mountpoints_under(root)
 
     def _mount_encrypted_volume(
         self, image_path: pathlib.Path, mount_point: pathlib.Path, key: str
@@ -1010,20 +1476,30 @@ class SystemProvisioner:
         # image exists, or create a directory if it's for temporary use.
         try:
             # Simulation: just ensure the mount point is usable
+            self._mount_cache.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to mount encrypted volume: {e}")
             return False
 
-    def _unmount_encrypted_volume(self, mount_point: pathlib.Path) -> bool:
-        """Unmount an encrypted volume."""
-        if not self._is_mountpoint(str(mount_point)):
-            return True
+    def _unmount_encrypted_volume(
+        self, mount_point: Union[str, pathlib.Path]
+    ) -> bool:
+        """Unmount an encrypted volume.
 
+        A single lazy unmount detaches the mount along with anything
+        mounted below it. There is no mountpoint probe up front: a path
+        that is not mounted simply makes umount fail, which is treated
+        as already unmounted.
+        """
         logger.info(f"Unmounting volume at {mount_point}")
         try:
-            # Simulation: just use umount command
-            subprocess.run(["umount", "-l", str(mount_point)], check=False)
+            err = _lazy_unmount(str(mount_point))
+            if err not in (0, errno.EINVAL, errno.ENOENT):
+                logger.warning(
+                    "umount of %s failed: %s", mount_point, os.strerror(err)
+                )
+            self._mount_cache.invalidate()
             return True
         except Exception as e:
             logger.error(f"Failed to unmount volume: {e}")
@@ -1036,18 +1512,31 @@ class SystemProvisioner:
         if not self.encrypted_storage_dir:
             return None
 
-        realm_root = pathlib.Path(self.encrypted_storage_dir) / realm
-        if not realm_root.exists():
-            return None
+        realm_root = self._storage_root / realm
 
-        # Pattern: {source}.{timestamp}.img
-        candidates = list(realm_root.glob(f"{source}.*.img"))
-        if not candidates:
+        # Pattern: {source}.{timestamp}.img; the timestamp sorts by name, so
+        # a single pass keeping the greatest name finds the latest version
+        prefix = f"{source}."
+        suffix = ".img"
+        min_len = len(prefix) + len(suffix)
+        latest: Optional[str] = None
+        try:
+            with os.scandir(realm_root) as it:
+                for entry in it:
+                    name = entry.name
+                    if (
+                        len(name) >= min_len
+                        and name.startswith(prefix)
+                        and name.endswith(suffix)
+                        and (latest is None or name > latest)
+                    ):
+                        latest = name
+        except (FileNotFoundError, NotADirectoryError):
             return None
 
-        # Sort by name (timestamp is sortable)
-        candidates.sort()
-        return candidates[-1]
+        if latest is None:
+            return None
+        return realm_root / latest
 
     def _prepare_service_volumes(self, svc_info: ServiceInformation) -> None:
         """Prepare and mount volumes for the service."""
@@ -1057,14 +1546,13 @@ class SystemProvisioner:
         if not realm:
             return
 
-        realm_volumes = {v.name: v for v in (realm.volumes or [])}
+        realm_volumes = self._get_realm_volumes(realm_name)
 
-        reader = SystemConfigReader.singleton()
-        eff_def = reader.get_effective_service_definition(
+        eff_def = self.config_reader.get_effective_service_definition(
             svc_info.service,
+            svc_info.profile,
+            svc_info.variety,
             realm=svc_info.realm,
-            profile=svc_info.profile,
-            variety=svc_info.variety,
         )
 
         resolved_vols = []
@@ -1097,13 +1585,15 @@ class SystemProvisioner:
 
         realm_name = svc_info.realm
         instance_name = svc_info.name
-        storage_root = pathlib.Path(self.encrypted_storage_dir) / realm_name
+        storage_root = self._storage_root / realm_name
 
         if vol_def.type == VolumeType.TMP_WRITEABLE:
             # Create a unique directory for this instance
-            host_path = storage_root / "tmp" / instance_name / vol_def.name
-            host_path.mkdir(exist_ok=True, parents=True)
-            return str(host_path)
+            host_path = os.path.join(
+                storage_root, "tmp", instance_name, vol_def.name
+            )
+            os.makedirs(host_path, exist_ok=True)
+            return host_path
 
         elif vol_def.type == VolumeType.VERSIONED_READ_ONLY:
             # Find latest version
@@ -1135,14 +1625,22 @@ class SystemProvisioner:
         """Unmount and cleanup volumes for the service."""
         realm_name = svc_info.realm
         instance_name = svc_info.name
-        storage_root = pathlib.Path(self.encrypted_storage_dir) / realm_name
+        storage_root = self._storage_root / realm_name
 
         # Unmount versioned-read-only volumes
-        mounts_root = storage_root / "mounts" / instance_name
-        if mounts_root.exists():
-            for mnt in mounts_root.iterdir():
-                if mnt.is_dir() and self._is_mountpoint(str(mnt)):
-                    self._unmount_encrypted_volume(mnt)
+        mounts_root = os.path.join(storage_root, "mounts", instance_name)
+        try:
+            with os.scandir(mounts_root) as entries:
+                mounted = [
+                    entry.path
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                    and self._is_mountpoint(entry.path)
+                ]
+        except FileNotFoundError:
+            return
+        for mnt in mounted:
+            self._unmount_encrypted_volume(mnt)
 
     def persist_volume(
         self,
@@ -1159,15 +1657,16 @@ class SystemProvisioner:
 
         # Find the active tmp-writeable volume.
         # This implementation searches for any instance using this volume name.
-        realm_root = pathlib.Path(self.encrypted_storage_dir) / realm
+        realm_root = self._storage_root / realm
         tmp_root = realm_root / "tmp"
 
         source_dir = None
-        for instance_dir in tmp_root.iterdir():
-            vol_dir = instance_dir / volume_name
-            if vol_dir.exists():
-                source_dir = vol_dir
-                break
+        with os.scandir(tmp_root) as entries:
+            for entry in entries:
+                vol_dir = os.path.join(entry.path, volume_name)
+                if os.path.exists(vol_dir):
+                    source_dir = vol_dir
+                    break
 
         if not source_dir:
             logger.error(
@@ -1176,7 +1675,9 @@ class SystemProvisioner:
             )
             return None
 
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        # Local time, as before, so new versions keep sorting after the
+        # existing ones
+        timestamp = time.strftime("%Y%m%d%H%M%S")
         dest_img = realm_root / f"{destination_source}.{timestamp}.img"
 
         logger.info(f"Persisting {source_dir} to {dest_img}")
@@ -1198,21 +1699,13 @@ class SystemProvisioner:
 
     def _is_mountpoint(self, path: str) -> bool:
         try:
-            # Prefer /proc/self/mounts check for robustness
-            mp = False
-            with pathlib.Path("/proc/self/mounts").open() as f:
-                for line in f:
-                    try:
-                        parts = line.split()
-                        if len(parts) >= 2 and parts[1] == path:
-                            mp = True
-                            break
-                    except Exception:
-                        continue
-            if mp:
+            # os.path.ismount is a couple of lstat calls and catches most
+            # mounts (the device changes at the mountpoint)
+            if os.path.ismount(path):
                 return True
-            # Fallback to os.path.ismount
-            return os.path.ismount(path)
+            # Bind mounts from the same filesystem keep the parent's device;
+            # only those need the (cached) /proc/self/mounts table
+            return self._mount_cache.is_mountpoint(path)
         except Exception:
             return False
 
@@ -1242,15 +1735,14 @@ class SystemProvisioner:
             service_def: "ServiceDefinition",
         ) -> Iterable[ConfiguredServiceIdentifier]:
             if service_def.profiles and service_def.varieties:
-                for profile, variety in itertools.product(
-                    service_def.profiles.keys(), service_def.varieties.keys()
-                ):
-                    yield ConfiguredServiceIdentifier(
-                        service_name=service_def.service_name,
-                        realm=service_def.realm,
-                        profile=profile,
-                        variety=variety,
-                    )
+                for profile in service_def.profiles:
+                    for variety in service_def.varieties:
+                        yield ConfiguredServiceIdentifier(
+                            service_name=service_def.service_name,
+                            realm=service_def.realm,
+                            profile=profile,
+                            variety=variety,
+                        )
             elif service_def.profiles:
                 for profile in service_def.profiles:
                     yield ConfiguredServiceIdentifier(
@@ -1271,37 +1763,62 @@ class SystemProvisioner:
                     realm=service_def.realm,
                 )
 
-        targets: List[ConfiguredServiceIdentifier] = []
+        targets: Iterable[ConfiguredServiceIdentifier]
         if request.footprint_all_services:
-            for svc_def in self.config_reader.service_definitions:
-                for target in target_iterator(svc_def):
-                    targets.append(target)
-
+            targets = itertools.chain.from_iterable(
+                target_iterator(svc_def)
+                for svc_def in self.config_reader.service_definitions
+            )
         else:
             targets = request.services or []
-        logger.debug(f"footprint targets: {targets}")
 
         # Ensure system is unloaded before footprinting
         if self._active_services_cache.get_services():
             # If not unloaded, skip processing now
             return
 
-        # Footprint each target sequentially
-        for target in targets:
-            logger.info(f"footprinting service: {target.service_name}")
-            try:
-                logger.info("pre-footprint")
-                self._footprint_single_service(target)
-                logger.info("post-footprint (before except)")
-            except Exception as e:
-                logger.error(
-                    "Footprinting error for %s[%s][%s] - %s",
+        # Footprint each target sequentially, skipping any target that was
+        # already footprinted by this request
+        seen = set()
+        with self._footprint_usage_batch():
+            for target in targets:
+                if self._stop_event.is_set():
+                    break
+                target_key = (
                     target.service_name,
+                    target.realm,
                     target.profile,
                     target.variety,
-                    e,
                 )
-            logger.info("post-footprint (after except)")
+                if target_key in seen:
+                    logger.debug(
+                        "skipping duplicate footprint target: %s", target
+                    )
+                    continue
+                seen.add(target_key)
+                logger.info(f"footprinting service: {target.service_name}")
+                try:
+                    logger.info("pre-footprint")
+                    self._footprint_single_service(target)
+                    logger.info("post-footprint (before except)")
+                except Exception as e:
+                    logger.error(
+                        "Footprinting error for %s[%s][%s] - %s",
+                        target.service_name,
+                        target.profile,
+                        target.variety,
+                        e,
+                    )
+                logger.info("post-footprint (after except)")
+
+        # A shutdown cut the request short; leave it in the cache so it is
+        # retried
+        if self._stop_event.is_set():
+            logger.info(
+                "footprint request %s interrupted by shutdown",
+                request.request_id,
+            )
+            return
 
         # Remove the handled request from cache
         try:
@@ -1312,7 +1829,9 @@ class SystemProvisioner:
             remaining = [
                 r for r in current if r.request_id != request.request_id
             ]
-            self._footprint_request_cache.set_requests(remaining)
+            # Nothing to persist if the request is already gone
+            if len(remaining) != len(current):
+                self._footprint_request_cache.set_requests(remaining)
         except Exception as e:
             logger.error(
                 "Failed to remove completed footprint request %s: %s",
@@ -1337,16 +1856,7 @@ class SystemProvisioner:
         logger.info("entered _footprint_single_service")
 
         # Lookup service class first
-        tmp_svc_info = ServiceInformation(
-            name="temp",
-            service=target.service_name,
-            realm=target.realm,
-            profile=target.profile,
-            variety=target.variety,
-            status=ServiceStatus.STARTING,
-            info={},
-        )
-        service_cls = self._get_service_class_from_service_info(tmp_svc_info)
+        service_cls = self._get_service_class(target.service_name, target.realm)
         if not service_cls:
             logger.error(
                 "No provisionable service implementation found for type '%s'",
@@ -1372,15 +1882,21 @@ class SystemProvisioner:
             status=ServiceStatus.STARTING,
             info={},
         )
-        self.update_active_services([svc_info])
-
-        # Manually trigger start because the main loop is blocked by us
-        self._start_service(svc_info, service_cls, datetime.now())
-        # Persist the start_completed marker to cache
-        self._active_services_cache.set_services([svc_info])
-
-        # Wait for start completed marker
-        self._wait_for_start_completed(inst_name, timeout=60.0)
+        # The start and stop sequences each write the cache several times
+        # and read their own writes back; batch them so each sequence
+        # persists only its final state
+        with self._active_services_cache.batch():
+            self.update_active_services([svc_info])
+
+            # Manually trigger start because the main loop is blocked by us
+            self._start_service(svc_info, service_cls, datetime.now())
+            # Persist the start_completed marker to cache
+            self._active_services_cache.set_services([svc_info])
+
+            # _start_service sets the marker on svc_info itself; only go
+            # back to the cache for it when it is missing
+            if not svc_info.info.get("start_completed"):
+                self._wait_for_start_completed(inst_name, timeout=60.0)
         logger.info(f"service {inst_name} started successfully")
 
         # wait for configured run time
@@ -1392,68 +1908,109 @@ class SystemProvisioner:
             realm=target.realm,
         )
         footprint_config = effective_service_def.footprint
-        time.sleep(footprint_config.run_time)
-
-        # Measure post state
-        post = HostResources.inspect_host()
-        logger.info("post-state resources: %s", post)
-
-        # Compute deltas
-        usage = {
-            "cpu_cores": max(
-                0,
-                pre.available_cpu_cores - post.available_cpu_cores,
-            ),
-            "memory_gb": max(0.0, pre.available_ram_gb - post.available_ram_gb),
-            "vram_gb": max(0.0, pre.available_vram_gb - post.available_vram_gb),
-        }
+        if self._stop_event.wait(footprint_config.run_time or 0):
+            # Shutting down: measuring now would record a truncated run, so
+            # only stop the service
+            logger.info("footprinting of %s interrupted by shutdown", inst_name)
+        else:
+            # Measure post state
+            post = HostResources.inspect_host()
+            logger.info("post-state resources: %s", post)
 
-        # Persist to YAML
-        logger.info(f"writing footprint usage for {target.service_name}")
-        self._write_footprint_usage(
-            SystemUsageDelta(
-                service_name=target.service_name,
-                profile=target.profile,
-                variety=target.variety,
-                usage=ServiceInstanceUsage(**usage),
+            # Compute deltas
+            usage = {
+                "cpu_cores": max(
+                    0,
+                    pre.available_cpu_cores - post.available_cpu_cores,
+                ),
+                "memory_gb": max(
+                    0.0, pre.available_ram_gb - post.available_ram_gb
+                ),
+                "vram_gb": max(
+                    0.0, pre.available_vram_gb - post.available_vram_gb
+                ),
+            }
+
+            # Persist to YAML
+            logger.info(f"writing footprint usage for {target.service_name}")
+            self._write_footprint_usage(
+                SystemUsageDelta(
+                    service_name=target.service_name,
+                    profile=target.profile,
+                    variety=target.variety,
+                    usage=ServiceInstanceUsage(**usage),
+                )
             )
-        )
 
         # Stop the service and restore unloaded state
         # Request no services active -> will mark existing as STOPPING
         logger.info(f"stopping service {inst_name}")
-        self.update_active_services([])
+        with self._active_services_cache.batch():
+            self.update_active_services([])
+
+            # Manually trigger stop because the main loop is blocked by us
+            # We need the service info with status STOPPING; it was just
+            # read, so the stop need not re-verify it
+            target_svc = next(
+                (
+                    s
+                    for s in self._active_services_cache.get_services()
+                    if s.name == inst_name
+                ),
+                None,
+            )
+            if target_svc:
+                self._stop_service(
+                    target_svc, service_cls, datetime.now(), reverify=False
+                )
+
+            if not (target_svc and target_svc.info.get("stop_completed")):
+                self._wait_for_stop_completed(inst_name, timeout=60.0)
+
+            # After stop, clear cache to keep system unloaded. Persisting
+            # stop_completed first is unnecessary: nothing reads it once the
+            # entry is gone.
+            self._active_services_cache.set_services([])
 
-        # Manually trigger stop because the main loop is blocked by us
-        # We need the service info with status STOPPING
-        active = self._active_services_cache.get_services()
-        target_svc = next((s for s in active if s.name == inst_name), None)
-        if target_svc:
-            self._stop_service(target_svc, service_cls, datetime.now())
-            # Persist stop_completed to cache
-            self._active_services_cache.set_services([target_svc])
+    def _wait_for_service_marker(
+        self,
+        instance_name: str,
+        marker: str,
+        timeout: float,
+    ) -> bool:
+        """Wait until the cached entry for instance_name has `marker` set in
+        its info dict.
 
-        self._wait_for_stop_completed(inst_name, timeout=60.0)
+        Returns:
+            True once the marker is seen, False on timeout or shutdown
 
-        # After stop, clear cache to keep system unloaded
-        self._active_services_cache.set_services([])
+        """
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            generation = self._active_services_cache.generation
+            for s in self._active_services_cache.get_services():
+                if s.name == instance_name and s.info and s.info.get(marker):
+                    return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Writes from this process wake us immediately; the poll
+            # interval bounds how late writes from other processes are seen
+            self._active_services_cache.wait_for_update(
+                generation,
+                min(remaining, SERVICE_MARKER_POLL_INTERVAL),
+            )
+        return False
 
     def _wait_for_start_completed(
         self,
         instance_name: str,
         timeout: float = 60.0,
     ) -> None:
-        start = time.time()
-        while time.time() - start < timeout:
-            services = self._active_services_cache.get_services()
-            for s in services:
-                if (
-                    s.name == instance_name
-                    and s.info
-                    and s.info.get("start_completed")
-                ):
-                    return
-            time.sleep(0.5)
+        if self._wait_for_service_marker(
+            instance_name, "start_completed", timeout
+        ):
+            return
         logger.warning(
             (
                 "Timeout waiting for service %s to start; proceeding with "
@@ -1467,17 +2024,10 @@ class SystemProvisioner:
         instance_name: str,
         timeout: float = 60.0,
     ) -> None:
-        start = time.time()
-        while time.time() - start < timeout:
-            services = self._active_services_cache.get_services()
-            for s in services:
-                if (
-                    s.name == instance_name
-                    and s.info
-                    and s.info.get("stop_completed")
-                ):
-                    return
-            time.sleep(0.5)
+        if self._wait_for_service_marker(
+            instance_name, "stop_completed", timeout
+        ):
+            return
         logger.warning(
             "Timeout waiting for service %s to stop; continuing",
             instance_name,
@@ -1496,40 +2046,96 @@ class SystemProvisioner:
             )
             return
 
-        # read yaml file as list of ServiceInstanceUsage objects and substitute
-        # the footprinted service usage record, if possible
-        usage_records = []
+        # substitute the footprinted service usage record into the index
+        usage = self._load_footprint_usage(path)
+        key = (
+            system_usage_delta.service_name,
+            system_usage_delta.profile,
+            system_usage_delta.variety,
+        )
+        record = system_usage_delta.model_dump()
+        # Re-measuring a service usually gives the same figures; the file
+        # already holds them then
+        if usage.get(key) == record:
+            return
+        usage[key] = record
+
+        if self._footprint_usage_batch_depth:
+            self._footprint_usage_unsaved = path
+            return
+        self._save_footprint_usage(path)
+
+    def _save_footprint_usage(self, path: str) -> None:
+        """Write the footprint usage index to `path`."""
+        usage = self._footprint_usage
+        # sort the list of usage records by service_name, profile, variety
+        usage_records = [
+            usage[key] for key in sorted(usage, key=_usage_sort_key)
+        ]
+
+        # write the updated yaml file. This is done in place rather than via
+        # a temp file + rename, because the backend container bind-mounts
+        # this single file and a rename over a mountpoint fails.
+        with open(path, "wb") as f:
+            yaml.dump(usage_records, f, Dumper=_YamlDumper, encoding="utf-8")
+        self._footprint_usage_source = (path, os.stat(path).st_mtime_ns)
+        self._footprint_usage_unsaved = None
+
+    @contextmanager
+    def _footprint_usage_batch(self) -> Generator[None, None, None]:
+        """Defer footprint usage writes made in the block to a single write
+        of the file when the (outermost) block exits.
+        """
+        self._footprint_usage_batch_depth += 1
         try:
-            with open(path) as f:
-                service_instance_usage_records = yaml.safe_load(f) or []
-        except FileNotFoundError:
-            pass
-        written = False
-        for usage_rec_dict in service_instance_usage_records:
-            usage_rec = SystemUsageDelta(**usage_rec_dict)
+            yield
+        finally:
+            self._footprint_usage_batch_depth -= 1
             if (
-                usage_rec.service_name == system_usage_delta.service_name
-                and usage_rec.profile == system_usage_delta.profile
-                and usage_rec.variety == system_usage_delta.variety
+                self._footprint_usage_batch_depth == 0
+                and self._footprint_usage_unsaved
             ):
-                usage_records.append(system_usage_delta)
-                written = True
-            else:
-                usage_records.append(usage_rec)
-
-        # sort the list of usage records by service_name, profile, variety
-        def sortkey(rec: SystemUsageDelta):
-            return rec.service_name, rec.profile, rec.variety
+                self._save_footprint_usage(self._footprint_usage_unsaved)
 
-        usage_records.sort(key=sortkey)
+    def _load_footprint_usage(
+        self,
+        path: str,
+    ) -> Dict[tuple, dict]:
+        """Return the footprint usage records keyed by
+        (service_name, profile, variety).
+
+        The file is parsed once and the index is reused by later writes; it
+        is only re-read if the file was changed by someone else. Records are
+        kept as the plain dicts that get dumped back to the file, so records
+        that are not being replaced never go through model validation.
+        """
+        # Records not yet written by a batch only exist in the index
+        if self._footprint_usage_unsaved == path:
+            return self._footprint_usage
 
-        # add the record if it wasn't subbed in before
-        if not written:
-            usage_records.append(system_usage_delta)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if (
+            self._footprint_usage is not None
+            and self._footprint_usage_source == (path, mtime)
+        ):
+            return self._footprint_usage
+
+        records = []
+        if mtime is not None:
+            # Binary, so libyaml decodes the bytes itself
+            with open(path, "rb") as f:
+                records = yaml.load(f, Loader=_YamlLoader) or []
 
-        # write the updated yaml file
-        with open(path, "w") as f:
-            yaml.safe_dump([rec.model_dump() for rec in usage_records], f)
+        usage = {
+            (rec["service_name"], rec.get("profile"), rec.get("variety")): rec
+            for rec in records
+        }
+        self._footprint_usage = usage
+        self._footprint_usage_source = (path, mtime)
+        return usage
 
     def _init_service(
         self,
@@ -1549,12 +2155,13 @@ class SystemProvisioner:
 
         # resolve and attach properties
         effective_def = self.config_reader.get_effective_service_definition(
-            service_def,
+            service_info.service,
             service_info.profile,
             service_info.variety,
             realm=service_info.realm,
         )
-        service_info.properties = effective_def.properties
+        # Copy: the config reader shares the resolved definition
+        service_info.properties = dict(effective_def.properties)
 
         service_info.status = ServiceStatus.STARTING
         return service_info
@@ -1,10 +1,10 @@
 import importlib
-import inspect
 import os
 import pkgutil
-import sys
 import threading
-from typing import ClassVar, Optional, Type
+from collections import deque
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Optional, Type
 
 from config.reader import SystemConfigReader
 from orchestration.models import (
@@ -26,8 +26,10 @@ class BaseProvisionableService(Service):
     # Internal service registry (lazy-initialized). Mark as ClassVar so Pydantic
     # does not wrap these as ModelPrivateAttr, which caused runtime errors like:
     # "ModelPrivateAttr object has no attribute 'get'" when accessing as a dict.
+    # Published as a read-only view, so lock-free readers can never see it
+    # change after initialization.
     _service_registry: ClassVar[
-        Optional[dict[str, Type["BaseProvisionableService"]]]
+        Optional[Mapping[str, Type["BaseProvisionableService"]]]
     ] = None
     _service_registry_lock: ClassVar[threading.Lock] = threading.Lock()
 
@@ -95,7 +97,9 @@ class BaseProvisionableService(Service):
         if cls._service_registry is None:
             with cls._service_registry_lock:
                 if cls._service_registry is None:
-                    cls._service_registry = cls._build_service_registry()
+                    cls._service_registry = MappingProxyType(
+                        cls._build_service_registry()
+                    )
         return list(cls._service_registry.values())
 
     @classmethod
@@ -117,7 +121,9 @@ class BaseProvisionableService(Service):
         # Lazily build the registry with thread-safety
         with cls._service_registry_lock:
             if cls._service_registry is None:
-                cls._service_registry = cls._build_service_registry()
+                cls._service_registry = MappingProxyType(
+                    cls._build_service_registry()
+                )
         return cls._service_registry.get(service_type)
 
     @classmethod
@@ -151,47 +157,38 @@ class BaseProvisionableService(Service):
         except Exception as e:
             logger.warning("Error while scanning services package: %s", e)
 
-        # After importing, inspect loaded modules under services.*
-        for mod_name, module in list(sys.modules.items()):
-            if not isinstance(mod_name, str):
+        # Every loaded service class is reachable through the subclass
+        # hierarchy, so walk that rather than sweeping sys.modules
+        pending = deque(cls.__subclasses__())
+        seen = set(pending)
+        while pending:
+            obj = pending.popleft()
+            for sub in obj.__subclasses__():
+                if sub not in seen:
+                    seen.add(sub)
+                    pending.append(sub)
+
+            # Ensure it's defined in the services package
+            if not getattr(obj, "__module__", "").startswith("services"):
                 continue
-            if not mod_name.startswith("services.") and mod_name != "services":
+            st = getattr(obj, "service_type", None)
+            if not isinstance(st, str) or not st:
                 continue
-            try:
-                for _, obj in inspect.getmembers(module, inspect.isclass):
-                    # Ensure it's defined in the services package
-                    # (not an import alias)
-                    if not getattr(obj, "__module__", "").startswith(
-                        "services",
-                    ):
-                        continue
-                    if not issubclass(obj, cls) or obj is cls:
-                        continue
-                    st = getattr(obj, "service_type", None)
-                    if not isinstance(st, str) or not st:
-                        continue
-                    if st in registry:
-                        # Duplicate service_type; warn and keep the first one
-                        if registry[st] is not obj:
-                            logger.warning(
-                                (
-                                    f"Duplicate service_type '{st}' for "
-                                    f"{obj.__module__}.{obj.__name__}; "
-                                )
-                                + (
-                                    "already registered to "
-                                    f"{registry[st].__module__}."
-                                    f"{registry[st].__name__}. Ignoring."
-                                ),
-                            )
-                        continue
-                    registry[st] = obj
-            except Exception as e:
-                logger.debug(
-                    "Skipping module %s during registry build due to error: %s",
-                    mod_name,
-                    e,
+            if st in registry:
+                # Duplicate service_type; warn and keep the first one
+                logger.warning(
+                    (
+                        f"Duplicate service_type '{st}' for "
+                        f"{obj.__module__}.{obj.__name__}; "
+                    )
+                    + (
+                        "already registered to "
+                        f"{registry[st].__module__}."
+                        f"{registry[st].__name__}. Ignoring."
+                    ),
                 )
+                continue
+            registry[st] = obj
 
         if not registry:
             logger.warning(
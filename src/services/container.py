@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import itertools
 import os
+import queue
 import subprocess
 import tempfile
 import threading
 import time
-from typing import Any, ClassVar
+from typing import Any, Callable, ClassVar
 
 from hosts.resources import HostResources
 from orchestration.models import (
@@ -19,15 +21,71 @@ from util.logger import get_logger
 from util.runner_logs_cache import RunnerLogsCache
 
 CONTAINER_HEALTHCHECK_TIMEOUT = 300
+# Seconds between inspections when no event stream is available
+CONTAINER_POLL_INTERVAL = 1
+# Longest wait for a container event before inspecting again regardless
+CONTAINER_EVENT_RECHECK_INTERVAL = 10
+# Most container log lines sent to the runner logs cache in one write,
+# and the longest (seconds) a line waits for its batch to fill
+LOG_BATCH_MAX_LINES = 64
+LOG_BATCH_MAX_DELAY = 0.05
+
+# Values of the GPU environment variable that request GPU access
+_GPU_FLAG_VALUES = frozenset(("1", "true", "yes"))
+_AMDGPU_OPTS = (
+    "--device",
+    "/dev/kfd",
+    "--device",
+    "/dev/dri",
+    "--security-opt",
+    "seccomp=unconfined",
+)
+_NVIDIA_OPTS = ("--gpus", "all")
 
 logger = get_logger(__name__)
 
 
+def _drain_log_batches(
+    lines: queue.Queue,
+    write: Callable[[list[str]], None],
+) -> None:
+    """Pass lines from `lines` to `write` in batches, until a None arrives.
+
+    A batch is written once it holds LOG_BATCH_MAX_LINES lines, or once
+    its first line has waited LOG_BATCH_MAX_DELAY seconds.
+    """
+    batch: list[str] = []
+    deadline = 0.0
+    while True:
+        if batch:
+            try:
+                line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                write(batch)
+                batch = []
+                continue
+        else:
+            line = lines.get()
+            deadline = time.monotonic() + LOG_BATCH_MAX_DELAY
+        if line is None:
+            if batch:
+                write(batch)
+            return
+        batch.append(line)
+        if len(batch) >= LOG_BATCH_MAX_LINES:
+            write(batch)
+            batch = []
+
+
 class ContainerService(BaseProvisionableService):
     service_type: ClassVar[str] = "container"
 
     _provisioned_networks: ClassVar[list[NetworkInstance]] = []
 
+    _DOCKER_RUN: ClassVar[tuple[str, ...]] = ("docker", "run")
+    # GPU drivers found by the first successful probe
+    _gpu_drivers: ClassVar[frozenset[str] | None] = None
+
     # Container-specific configuration (class defaults, overridable per
     # instance via __init__ kwargs)
     container_image: str | None = None
@@ -76,6 +134,28 @@ class ContainerService(BaseProvisionableService):
             )
         return self._effective_def
 
+    def _effective_definition_or_none(
+        self,
+    ) -> EffectiveServiceDefinition | None:
+        """Return the effective definition, or None if the service or its
+        profile/variety is not defined. A failed resolution is logged and
+        remembered, so the accessors that fall back to defaults do not each
+        retry it.
+        """
+        if getattr(self, "_effective_def_failed", False):
+            return None
+        try:
+            return self.effective_definition
+        except (ValueError, KeyError) as e:
+            self._effective_def_failed = True
+            logger.warning(
+                "Cannot resolve effective definition for service %s, "
+                "using defaults: %s",
+                self.get_service_information().name,
+                e,
+            )
+            return None
+
     @staticmethod
     def effective_network_name(network: Any) -> str:
         """Return the effective network name for Docker."""
@@ -240,8 +320,8 @@ class ContainerService(BaseProvisionableService):
         image = self.get_container_image()
         if not image:
             logger.error(
-                "No container image specified for service"
-                f" {self._service_info.name}",
+                "No container image specified for service %s",
+                self._service_info.name,
             )
             return
 
@@ -253,13 +333,15 @@ class ContainerService(BaseProvisionableService):
             subprocess.run(
                 ["docker", "rm", "-f", container_name],
                 check=False,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
         except Exception as e:
             # log as info with exception type and msg
             logger.info(
-                f"Error removing stale container: {type(e).__name__}({e})"
+                "Error removing stale container: %s(%s)",
+                type(e).__name__,
+                e,
             )
 
         # compute the container start command
@@ -269,9 +351,9 @@ class ContainerService(BaseProvisionableService):
             cmd = self.get_container_start_command(image, secrets_file)
 
             logger.info(
-                "Starting container for service "
-                f"{self._service_info.name} with command: "
-                f'"{" ".join(cmd)}"',
+                'Starting container for service %s with command: "%s"',
+                self._service_info.name,
+                " ".join(cmd),
             )
 
             # start the container in foreground using Popen
@@ -287,79 +369,87 @@ class ContainerService(BaseProvisionableService):
             if secrets_file and os.path.exists(secrets_file):
                 os.remove(secrets_file)
 
-        # Real-time Log Streaming to Redis
+        # Real-time Log Streaming to Redis. The reader only drains the
+        # pipe; the writer sends what it has read to Redis in batches.
+        log_lines: queue.Queue = queue.Queue()
+
         def log_reader():
             try:
-                provisioner = SystemProvisioner.singleton()
-                runner_logs_cache = RunnerLogsCache(provisioner.get_cache())
                 for line in process.stdout:
                     if line:
-                        logger.info(f"Container {container_name}: {line}")
-                        runner_logs_cache.add_log_line(
-                            container_name,
-                            line.strip(),
-                        )
+                        logger.info("Container %s: %s", container_name, line)
+                        log_lines.put(line.strip())
             except Exception as e:
-                logger.error(f"Error in log_reader for {container_name}: {e}")
+                logger.error(
+                    "Error in log_reader for %s: %s", container_name, e
+                )
             finally:
+                log_lines.put(None)
                 if process.stdout:
                     process.stdout.close()
 
+        def log_writer():
+            runner_logs_cache = None
+            try:
+                provisioner = SystemProvisioner.singleton()
+                runner_logs_cache = RunnerLogsCache(provisioner.get_cache())
+            except Exception as e:
+                logger.error(
+                    "Error in log_writer for %s: %s", container_name, e
+                )
+
+            def write(batch: list[str]) -> None:
+                if runner_logs_cache is not None:
+                    runner_logs_cache.add_log_lines(container_name, batch)
+
+            _drain_log_batches(log_lines, write)
+
         log_thread = threading.Thread(target=log_reader, daemon=True)
         log_thread.start()
+        threading.Thread(target=log_writer, daemon=True).start()
 
         # Give it a moment to actually start or fail
         time.sleep(1)
         if process.poll() is not None:
             logger.error(
-                f"Container process for {container_name} exited "
-                f"immediately with code {process.returncode}"
+                "Container process for %s exited immediately with code %s",
+                container_name,
+                process.returncode,
             )
             return
 
-        # Explicitly fetch the container_id
-        container_id = None
-        for _ in range(10):
-            id_result = subprocess.run(
-                [
-                    "docker",
-                    "inspect",
-                    "--format",
-                    "{{.Id}}",
-                    container_name,
-                ],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if id_result.returncode == 0:
-                container_id = id_result.stdout.strip()
-                break
-            time.sleep(0.5)
-
-        if not container_id:
-            logger.error(f"Failed to fetch container ID for {container_name}")
-
         # Wait for container to be running and healthy (if it has a
-        # healthcheck)
-        max_wait_time = CONTAINER_HEALTHCHECK_TIMEOUT  # seconds
-        wait_interval = 1  # seconds
-        elapsed_time = 0
+        # healthcheck). Rather than re-inspecting on a fixed interval,
+        # block on the container's state-change events and inspect again
+        # only when one arrives.
+        watcher, events = self._watch_container_events(container_name)
+        try:
+            self._wait_for_container_ready(process, container_name, events)
+        finally:
+            if watcher is not None:
+                watcher.terminate()
+                watcher.wait()
 
-        logger.info(
-            f"elapsed time: {elapsed_time}, "
-            f"max wait time: {max_wait_time}, "
-            f"wait interval: {wait_interval}"
-        )
+    def _wait_for_container_ready(
+        self,
+        process: subprocess.Popen,
+        container_name: str,
+        events: queue.Queue | None,
+    ) -> None:
+        """Inspect the container until it is running and not in the
+        'starting' health state, then record its state and connect it to
+        any additional networks.
+        """
+        max_wait_time = CONTAINER_HEALTHCHECK_TIMEOUT  # seconds
+        deadline = time.monotonic() + max_wait_time
 
-        while elapsed_time < max_wait_time:
-            # Check if container is running and its health status
-            # Using container_name instead of container_id per plan
+        while True:
+            # The container id comes from the same inspect as its state
             check_cmd = [
                 "docker",
                 "inspect",
                 (
-                    "--format={{.State.Status}} {{.State.Running}} "
+                    "--format={{.Id}} {{.State.Status}} {{.State.Running}} "
                     "{{if .State.Health}}{{.State.Health.Status}}"
                     "{{else}}none{{end}}"
                 ),
@@ -368,38 +458,29 @@ class ContainerService(BaseProvisionableService):
             check_result = subprocess.run(
                 check_cmd,
                 check=False,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
             )
 
-            if check_result.returncode == 0:
-                output = check_result.stdout.strip()
-                parts = output.split()
-                status = ""
-                running = ""
-                health = "none"
-
-                if len(parts) == 3:
-                    status, running, health = parts
-                elif len(parts) == 2:
-                    running, health = parts
-                elif len(parts) == 1:
-                    running = parts[0]
+            parts = check_result.stdout.split()
+            if check_result.returncode == 0 and len(parts) == 4:
+                container_id, status, running, health = parts
 
                 # Container is considered available if it's running
                 # and not in the 'starting' health state.
                 if running == "true" and health != "starting":
                     logger.info(
-                        f"Container for service "
-                        f"{self._service_info.name} is now "
-                        f"{status} and {health}",
+                        "Container for service %s is now %s and %s",
+                        self._service_info.name,
+                        status,
+                        health,
                     )
 
                     # Update local service info
                     if self._service_info.info is None:
                         self._service_info.info = {}
-                    if container_id:
-                        self._service_info.info["container_id"] = container_id
+                    self._service_info.info["container_id"] = container_id
                     self._service_info.info["container_status"] = status
                     if health != "none":
                         self._service_info.info["container_health"] = health
@@ -407,7 +488,6 @@ class ContainerService(BaseProvisionableService):
                     # Connect to additional networks if defined
                     networks = self.effective_definition.networks
                     if len(networks) > 1:
-                        target_id = container_id or container_name
                         for network_name in networks[1:]:
                             eff_net_name = self._get_effective_network_name(
                                 network_name
@@ -417,36 +497,103 @@ class ContainerService(BaseProvisionableService):
                                 "network",
                                 "connect",
                                 eff_net_name,
-                                target_id,
+                                container_id,
                             ]
                             logger.info(
-                                f"Connecting container {target_id} to "
-                                f"network {eff_net_name}",
+                                "Connecting container %s to network %s",
+                                container_id,
+                                eff_net_name,
                             )
                             subprocess.run(connect_cmd, check=True)
                     return
 
                 if running != "true" and process.poll() is not None:
                     logger.error(
-                        f"Container for service "
-                        f"{self._service_info.name} stopped "
-                        "unexpectedly",
+                        "Container for service %s stopped unexpectedly",
+                        self._service_info.name,
                     )
                     return
 
-            time.sleep(wait_interval)
-            elapsed_time += wait_interval
-            logger.info(
-                f"elapsed time: {elapsed_time}, "
-                f"max wait time: {max_wait_time}, "
-                f"wait interval: {wait_interval}"
-            )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if events is None:
+                time.sleep(min(CONTAINER_POLL_INTERVAL, remaining))
+                continue
+            try:
+                event = events.get(
+                    timeout=min(CONTAINER_EVENT_RECHECK_INTERVAL, remaining)
+                )
+            except queue.Empty:
+                # Re-inspect anyway, in case an event was missed while
+                # the watcher was subscribing
+                continue
+            if event is None:
+                # The event stream ended; poll for the rest of the wait
+                events = None
+            else:
+                logger.debug("Container %s event: %s", container_name, event)
 
         logger.error(
-            f"Container for service {self._service_info.name} did not"
-            " start within the expected time"
+            "Container for service %s did not start within the expected time",
+            self._service_info.name,
         )
 
+    @staticmethod
+    def _watch_container_events(
+        container_name: str,
+    ) -> tuple[subprocess.Popen | None, queue.Queue | None]:
+        """Stream start, die and health_status events for the container.
+
+        Returns:
+            The `docker events` process and a queue receiving one item per
+            event and None once the stream ends, or (None, None) if the
+            watcher could not be started.
+        """
+        try:
+            watcher = subprocess.Popen(
+                [
+                    "docker",
+                    "events",
+                    "--filter",
+                    f"container={container_name}",
+                    "--filter",
+                    "event=start",
+                    "--filter",
+                    "event=die",
+                    "--filter",
+                    "event=health_status",
+                    "--format",
+                    "{{.Status}}",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as e:
+            logger.info(
+                "Cannot watch events for %s, polling instead: %s(%s)",
+                container_name,
+                type(e).__name__,
+                e,
+            )
+            return None, None
+
+        events: queue.Queue = queue.Queue()
+
+        def event_reader():
+            try:
+                for line in watcher.stdout:
+                    events.put(line.strip())
+            except Exception as e:
+                logger.debug("Event reader for %s: %s", container_name, e)
+            finally:
+                events.put(None)
+
+        threading.Thread(target=event_reader, daemon=True).start()
+        return watcher, events
+
     def stop(self):
         """Stop the service container."""
         # Determine container ID or name
@@ -463,58 +610,51 @@ class ContainerService(BaseProvisionableService):
             result = subprocess.run(
                 stop_cmd,
                 check=False,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
             )
 
             if result.returncode == 0:
                 logger.info(
-                    f"Container for service {self._service_info.name}"
-                    " stopped and removed successfully",
+                    "Container for service %s stopped and removed successfully",
+                    self._service_info.name,
                 )
             else:
                 logger.warning(
-                    f"Failed to stop/remove container for service"
-                    f" {self._service_info.name}: {result.stderr}",
+                    "Failed to stop/remove container for service %s: %s",
+                    self._service_info.name,
+                    result.stderr,
                 )
         except Exception as e:
             logger.error(
-                "Unexpected error stopping service "
-                f"{self._service_info.name}: {e}",
+                "Unexpected error stopping service %s: %s",
+                self._service_info.name,
+                e,
             )
 
     # --- Container configuration accessors and options builders ---
     def get_container_image(self):
         if self.container_image:
             return self.container_image
-        try:
-            return self.effective_definition.image
-        except Exception:
-            return ""
+        eff_def = self._effective_definition_or_none()
+        return eff_def.image if eff_def else ""
 
     def get_effective_depends_on(self) -> list[str]:
-        try:
-            return self.effective_definition.depends_on
-        except Exception:
-            return []
+        eff_def = self._effective_definition_or_none()
+        return eff_def.depends_on if eff_def else []
 
     def get_effective_command(self) -> Any:
-        try:
-            return self.effective_definition.command
-        except Exception:
-            return None
+        eff_def = self._effective_definition_or_none()
+        return eff_def.command if eff_def else None
 
     def get_effective_entrypoint(self) -> Any:
-        try:
-            return self.effective_definition.entrypoint
-        except Exception:
-            return None
+        eff_def = self._effective_definition_or_none()
+        return eff_def.entrypoint if eff_def else None
 
     def get_effective_env_file(self) -> list[str]:
-        try:
-            return self.effective_definition.env_file
-        except Exception:
-            return []
+        eff_def = self._effective_definition_or_none()
+        return eff_def.env_file if eff_def else []
 
     def get_container_name(self):
         return f"ozsvc--{self._service_info.realm}--{self._service_info.name}"
@@ -522,24 +662,30 @@ class ContainerService(BaseProvisionableService):
     def get_container_options__standard(self) -> list[str]:
         return ["--name", self.get_container_name()]
 
+    @classmethod
+    def _installed_gpu_drivers(cls) -> frozenset[str]:
+        """Return the host's GPU kernel drivers, probing (via lsmod) only
+        until some are found; loaded drivers stay loaded, so a non-empty
+        result is kept for the life of the process.
+        """
+        drivers = cls._gpu_drivers
+        if drivers is None:
+            drivers = frozenset(HostResources.installed_gpu_drivers())
+            if drivers:
+                cls._gpu_drivers = drivers
+        return drivers
+
     def get_container_options__gpu(self) -> list[str]:
         gpu_opts = []
         env = self.get_container_environment() or {}
         gpu_flag = str(env.get("GPU", "")).lower()
-        if gpu_flag not in ("1", "true", "yes"):
+        if gpu_flag not in _GPU_FLAG_VALUES:
             return gpu_opts
-        installed_gpu_drivers = HostResources.installed_gpu_drivers()
+        installed_gpu_drivers = self._installed_gpu_drivers()
         if "amdgpu" in installed_gpu_drivers:
-            gpu_opts += [
-                "--device",
-                "/dev/kfd",
-                "--device",
-                "/dev/dri",
-                "--security-opt",
-                "seccomp=unconfined",
-            ]
+            gpu_opts.extend(_AMDGPU_OPTS)
         if "nvidia" in installed_gpu_drivers:
-            gpu_opts += ["--gpus", "all"]
+            gpu_opts.extend(_NVIDIA_OPTS)
         return gpu_opts
 
     def get_container_options__port(self) -> list[str]:
@@ -568,20 +714,16 @@ class ContainerService(BaseProvisionableService):
         return port_opts
 
     def get_container_options__volume(self) -> list[str]:
-        volume_opts = []
-        container_vols = self.get_container_volumes()
-        if container_vols:
-            for volume in container_vols:
-                volume_opts.extend(["-v", volume])
-        return volume_opts
+        container_vols = self.get_container_volumes() or ()
+        return [opt for volume in container_vols for opt in ("-v", volume)]
 
     def get_container_options__environment(self) -> list[str]:
-        env_opts = []
-        container_env = self.get_container_environment()
-        if container_env:
-            for key, value in container_env.items():
-                env_opts.extend(["-e", f"{key}={value}"])
-        return env_opts
+        container_env = self.get_container_environment() or {}
+        return [
+            opt
+            for key, value in container_env.items()
+            for opt in ("-e", f"{key}={value}")
+        ]
 
     def get_container_options__network(self) -> list[str]:
         networks = self.effective_definition.networks
@@ -673,24 +815,18 @@ class ContainerService(BaseProvisionableService):
         image: str,
         secrets_file: str | None = None,
     ) -> list[str]:
-        docker_cmd = ["docker", "run"]
-        if secrets_file:
-            docker_cmd.extend(["--env-file", secrets_file])
-        std_opts = self.get_container_options__standard()
-        gpu_opts = self.get_container_options__gpu()
-        port_opts = self.get_container_options__port()
-        net_opts = self.get_container_options__network()
-        env_opts = self.get_container_options__environment()
-        vol_opts = self.get_container_options__volume()
-        cmd = (
-            docker_cmd
-            + std_opts
-            + gpu_opts
-            + port_opts
-            + net_opts
-            + env_opts
-            + vol_opts
-            + [f"ozwald-{image}"]
+        cmd = list(
+            itertools.chain(
+                self._DOCKER_RUN,
+                ("--env-file", secrets_file) if secrets_file else (),
+                self.get_container_options__standard(),
+                self.get_container_options__gpu(),
+                self.get_container_options__port(),
+                self.get_container_options__network(),
+                self.get_container_options__environment(),
+                self.get_container_options__volume(),
+                (f"ozwald-{image}",),
+            )
         )
         logger.info("Container start command: %s", " ".join(cmd))
         return cmd
@@ -699,10 +835,8 @@ class ContainerService(BaseProvisionableService):
     def get_container_environment(self) -> dict | None:
         if self.container_environment is not None:
             return self.container_environment
-        try:
-            return self.effective_definition.environment
-        except Exception:
-            return None
+        eff_def = self._effective_definition_or_none()
+        return eff_def.environment if eff_def else None
 
     def get_container_volumes(self) -> list[str] | None:
         if self.container_volumes is not None:
@@ -716,10 +850,8 @@ class ContainerService(BaseProvisionableService):
             return self._service_info.info["resolved_volumes"]
 
         # Resolve volumes with profile/variety-aware merge
-        try:
-            return self.effective_definition.volumes
-        except Exception:
-            return None
+        eff_def = self._effective_definition_or_none()
+        return eff_def.volumes if eff_def else None
 
     def get_internal_container_port(self) -> int | None:
         return self.container_port__internal
@@ -1,18 +1,34 @@
 import json
-from typing import List
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator, List, Optional, Tuple
 
 import redis
 
 from orchestration.models import Cache, ServiceInformation
+from util.cache_updates import publish_cache_update
 from util.logger import get_logger
 
 logger = get_logger()
 
+# Retries of a batch() flush that lost a race with another writer
+BATCH_FLUSH_MAX_ATTEMPTS = 20
+BATCH_FLUSH_INITIAL_DELAY = 0.01
+BATCH_FLUSH_MAX_DELAY = 0.2
+
 
 class WriteCollision(Exception):
     """Exception raised when a write collision occurs."""
 
 
+class SnapshotConflict(WriteCollision):
+    """Exception raised when a compare-and-set write finds the cache changed
+    since the snapshot it was based on.
+    """
+
+
 class ActiveServicesCache:
     """Redis-based cache for storing and retrieving active service
     information.
@@ -32,6 +48,12 @@ class ActiveServicesCache:
         """
         self.cache = cache
         self._redis_client = self._initialize_redis_client()
+        # Bumped after every successful set_services() so in-process
+        # waiters can block on the next write instead of polling Redis
+        self._generation = 0
+        self._updated = threading.Condition()
+        # Per-thread state of batch() blocks
+        self._batch = threading.local()
 
     def _initialize_redis_client(self) -> redis.Redis:
         """Initialize Redis client from cache configuration."""
@@ -58,10 +80,91 @@ class ActiveServicesCache:
         """Store the active services list in the cache with locking to
         prevent race conditions.
 
+        Inside a batch() block the write is deferred until the block exits.
+
+        Args:
+            services: List of ServiceInformation objects to cache
+
+        """
+        json_data = self._encode(services)
+
+        if getattr(self._batch, "depth", 0):
+            self._batch.pending = json_data
+            return
+
+        self._store(json_data)
+
+    def compare_and_set_services(
+        self,
+        version: Optional[str],
+        services: List[ServiceInformation],
+    ) -> None:
+        """Store `services` only if the cache still holds the snapshot that
+        get_snapshot() returned `version` for.
+
+        Readers are never blocked, and a writer only has to retry when
+        another write actually landed between its read and its write.
+
         Args:
+            version: Version token returned by get_snapshot()
             services: List of ServiceInformation objects to cache
 
+        Raises:
+            SnapshotConflict: If the cache changed since the snapshot
+
         """
+        json_data = self._encode(services)
+
+        if getattr(self._batch, "depth", 0):
+            if self._read_raw() != version:
+                raise SnapshotConflict("Active services changed since read")
+            self._batch.pending = json_data
+            return
+
+        self._compare_and_store(version, json_data)
+
+    def _compare_and_store(
+        self, version: Optional[str], json_data: str
+    ) -> None:
+        """Write encoded services to Redis if the key still holds
+        `version`, in a WATCHed transaction.
+        """
+        with self._redis_client.pipeline() as pipe:
+            try:
+                # WATCH makes EXEC fail if any client writes the key
+                # between this check and the SET
+                pipe.watch(self.CACHE_KEY)
+                if pipe.get(self.CACHE_KEY) != version:
+                    raise SnapshotConflict(
+                        "Active services changed since read",
+                    )
+                pipe.multi()
+                pipe.set(self.CACHE_KEY, json_data)
+                pipe.execute()
+            except redis.exceptions.WatchError as e:
+                raise SnapshotConflict(
+                    "Active services changed since read",
+                ) from e
+        self._announce()
+
+    @staticmethod
+    def _encode(services: List[ServiceInformation]) -> str:
+        # Convert ServiceInformation objects to JSON-serializable
+        # dictionaries and encode as JSON
+        services_data = [
+            service.model_dump(mode="json") for service in services
+        ]
+        return json.dumps(services_data)
+
+    def _announce(self) -> None:
+        """Notify subscribers and in-process waiters of a write."""
+        publish_cache_update(self._redis_client, self.CACHE_KEY)
+        with self._updated:
+            self._generation += 1
+            self._updated.notify_all()
+
+    def _store(self, json_data: str) -> None:
+        """Write encoded services to Redis under the cache lock."""
         # Acquire lock with timeout
         lock = self._redis_client.lock(self.LOCK_KEY, timeout=self.LOCK_TIMEOUT)
 
@@ -69,15 +172,8 @@ class ActiveServicesCache:
             # Attempt to acquire the lock
             if lock.acquire(blocking=False):
                 try:
-                    # Convert ServiceInformation objects to JSON-serializable
-                    # dictionaries
-                    services_data = [
-                        service.model_dump(mode="json") for service in services
-                    ]
-
-                    # Encode as JSON and store in Redis
-                    json_data = json.dumps(services_data)
                     self._redis_client.set(self.CACHE_KEY, json_data)
+                    self._announce()
                 finally:
                     # Always release the lock
                     lock.release()
@@ -90,6 +186,111 @@ class ActiveServicesCache:
                 f"Lock error while setting active services: {e}",
             ) from e
 
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        """Coalesce set_services() calls made by this thread into a single
+        write when the (outermost) block exits.
+
+        get_services() calls in the block see the deferred value, so code
+        that writes and then reads back its own state behaves as if each
+        write had gone to Redis. Other threads and processes only see the
+        final state.
+
+        The write is only made when the block completes; if it raises, the
+        deferred value is dropped. The write is a compare-and-set against
+        the value the cache held when the block was entered. Should another
+        writer have changed the cache in the meantime, the entries this
+        block added, changed or removed are re-applied on top of the new
+        value and the write is retried.
+        """
+        batch = self._batch
+        batch.depth = getattr(batch, "depth", 0) + 1
+        if batch.depth == 1:
+            batch.pending = None
+            batch.base = self._redis_client.get(self.CACHE_KEY)
+        try:
+            yield
+        except BaseException:
+            if batch.depth == 1:
+                batch.pending = None
+            raise
+        finally:
+            batch.depth -= 1
+        if batch.depth == 0 and batch.pending is not None:
+            json_data, batch.pending = batch.pending, None
+            self._flush(batch.base, json_data)
+
+    def _flush(self, base: Optional[str], json_data: str) -> None:
+        """Write the final value of a batch() block, merging it with
+        writes that landed since `base` was read.
+
+        Raises:
+            SnapshotConflict: If the write kept losing to other writers
+
+        """
+        delay = BATCH_FLUSH_INITIAL_DELAY
+        for _ in range(BATCH_FLUSH_MAX_ATTEMPTS):
+            try:
+                self._compare_and_store(base, json_data)
+                return
+            except SnapshotConflict:
+                time.sleep(delay * (0.5 + random.random() * 0.5))
+                delay = min(delay * 2, BATCH_FLUSH_MAX_DELAY)
+            current = self._redis_client.get(self.CACHE_KEY)
+            json_data = self._merge(base, json_data, current)
+            base = current
+        raise SnapshotConflict(
+            "Failed to write batched active services: cache kept changing",
+        )
+
+    @classmethod
+    def _merge(
+        cls,
+        base: Optional[str],
+        ours: str,
+        theirs: Optional[str],
+    ) -> str:
+        """Re-apply the per-service changes that took `base` to `ours`
+        on top of `theirs`.
+        """
+        base_by_name = {s.name: s for s in cls._decode(base)}
+        ours_by_name = {s.name: s for s in cls._decode(ours)}
+        merged = {s.name: s for s in cls._decode(theirs)}
+        for name in base_by_name.keys() - ours_by_name.keys():
+            merged.pop(name, None)
+        for name, service in ours_by_name.items():
+            if base_by_name.get(name) != service:
+                merged[name] = service
+        return cls._encode(list(merged.values()))
+
+    @property
+    def generation(self) -> int:
+        """Number of successful set_services() calls made through this
+        instance.
+        """
+        return self._generation
+
+    def wait_for_update(self, generation: int, timeout: float) -> bool:
+        """Block until set_services() moves the generation past
+        `generation`, or until `timeout` seconds have elapsed.
+
+        Only writes made through this instance wake the caller; writes from
+        other processes are only seen by re-reading after a timeout.
+
+        Args:
+            generation: The generation observed before reading the cache
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the cache was written, False on timeout
+
+        """
+        with self._updated:
+            return self._updated.wait_for(
+                lambda: self._generation != generation,
+                timeout=timeout,
+            )
+
     def get_services(self) -> List[ServiceInformation]:
         """Retrieve the active services list from the cache.
 
@@ -97,9 +298,30 @@ class ActiveServicesCache:
             List of ServiceInformation objects, or empty list if not found
 
         """
-        # Retrieve JSON data from Redis
-        json_data = self._redis_client.get(self.CACHE_KEY)
+        return self._decode(self._read_raw())
+
+    def get_snapshot(
+        self,
+    ) -> Tuple[Optional[str], List[ServiceInformation]]:
+        """Retrieve the active services together with a version token for
+        compare_and_set_services().
+
+        Returns:
+            Tuple of (version, list of ServiceInformation objects)
+
+        """
+        json_data = self._read_raw()
+        return json_data, self._decode(json_data)
+
+    def _read_raw(self) -> Optional[str]:
+        # Retrieve JSON data from the pending batch write, or from Redis
+        json_data = getattr(self._batch, "pending", None)
+        if json_data is None:
+            json_data = self._redis_client.get(self.CACHE_KEY)
+        return json_data
 
+    @staticmethod
+    def _decode(json_data: Optional[str]) -> List[ServiceInformation]:
         if json_data is None:
             return []
 
@@ -0,0 +1,99 @@
+import time
+from typing import Callable, Optional
+
+import redis
+
+from orchestration.models import Cache
+from util.logger import get_logger
+
+logger = get_logger()
+
+# Redis pub/sub channel announcing writes to the provisioner caches. The
+# message is the key that was written.
+CACHE_UPDATES_CHANNEL = "cache_updates"
+
+# Seconds the subscriber thread blocks waiting for each message
+SUBSCRIBER_POLL_TIMEOUT = 1.0
+# Seconds to back off after the subscriber loses its Redis connection
+SUBSCRIBER_RETRY_DELAY = 1.0
+
+
+def publish_cache_update(redis_client: redis.Redis, key: str) -> None:
+    """Announce that `key` was written.
+
+    Notification is best effort: the value has already been stored, and
+    subscribers still poll, so a failed publish is only logged.
+    """
+    try:
+        redis_client.publish(CACHE_UPDATES_CHANNEL, key)
+    except redis.exceptions.RedisError as e:
+        logger.debug("Failed to publish cache update for %s: %s", key, e)
+
+
+class CacheUpdateSubscriber:
+    """Runs a callback whenever a provisioner cache is written, from any
+    process sharing the Redis instance.
+    """
+
+    def __init__(self, cache: Cache):
+        """Initialize the subscriber.
+
+        Args:
+            cache: Cache configuration object containing Redis connection
+                parameters
+
+        """
+        self.cache = cache
+        self._redis_client = self._initialize_redis_client()
+        self._thread: Optional[redis.client.PubSubWorkerThread] = None
+
+    def _initialize_redis_client(self) -> redis.Redis:
+        """Initialize Redis client from cache configuration."""
+        params = self.cache.parameters or {}
+        host = params.get("host", "localhost")
+        port = params.get("port", 6379)
+        db = params.get("db", 0)
+        password = params.get("password")
+
+        logger.info(
+            "Cache update subscriber initializing Redis client: "
+            f"host={host}, port={port}"
+        )
+
+        return redis.Redis(
+            host=host,
+            port=port,
+            db=db,
+            password=password,
+            decode_responses=True,
+        )
+
+    def start(self, callback: Callable[[str], None]) -> None:
+        """Subscribe and call `callback(key)` from a background thread for
+        each cache write.
+
+        Raises:
+            redis.exceptions.RedisError: If the subscription cannot be made
+
+        """
+        pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{
+            CACHE_UPDATES_CHANNEL: lambda message: callback(message["data"])
+        })
+
+        def _on_error(e, pubsub, thread):
+            # The pubsub reconnects and resubscribes on the next read
+            logger.warning("Cache update subscriber error: %s", e)
+            time.sleep(SUBSCRIBER_RETRY_DELAY)
+
+        self._thread = pubsub.run_in_thread(
+            sleep_time=SUBSCRIBER_POLL_TIMEOUT,
+            daemon=True,
+            exception_handler=_on_error,
+        )
+
+    def stop(self) -> None:
+        """Stop the background thread, if running."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
@@ -4,6 +4,7 @@ from typing import List
 import redis
 
 from orchestration.models import Cache, FootprintAction
+from util.cache_updates import publish_cache_update
 from util.logger import get_logger
 
 logger = get_logger()
@@ -74,6 +75,7 @@ class FootprintRequestCache:
                     # Encode as JSON and store in Redis
                     json_data = json.dumps(requests_data)
                     self._redis_client.set(self.CACHE_KEY, json_data)
+                    publish_cache_update(self._redis_client, self.CACHE_KEY)
                 finally:
                     lock.release()
             else:
@@ -131,6 +133,7 @@ class FootprintRequestCache:
                         self.CACHE_KEY,
                         json.dumps(current_list),
                     )
+                    publish_cache_update(self._redis_client, self.CACHE_KEY)
                 finally:
                     lock.release()
             else:
@@ -198,6 +201,7 @@ class FootprintRequestCache:
                         self.CACHE_KEY,
                         json.dumps(current_list),
                     )
+                    publish_cache_update(self._redis_client, self.CACHE_KEY)
                 finally:
                     lock.release()
             else:
@@ -939,6 +939,42 @@ class TestEffectiveServiceDefinition:
         )
         assert eff3.networks == ["base-net"]
 
+    def test_lookup_by_name_is_merged_once_per_key(self, tmp_path):
+        """Verify repeated lookups by name reuse the merged definition."""
+        cfg = {
+            "realms": {
+                "default": {
+                    "service-definitions": [
+                        {
+                            "name": "svc",
+                            "type": "container",
+                            "image": "base-img",
+                            "profiles": {"p1": {"image": "prof-img"}},
+                        }
+                    ]
+                }
+            }
+        }
+        cfg_path = tmp_path / "test_effective_memo.yml"
+        import yaml as _yaml
+
+        cfg_path.write_text(_yaml.safe_dump(cfg))
+        reader = ConfigReader(str(cfg_path))
+
+        eff1 = reader.get_effective_service_definition(
+            "svc", "p1", None, realm="default"
+        )
+        eff2 = reader.get_effective_service_definition(
+            "svc", "p1", None, realm="default"
+        )
+        base = reader.get_effective_service_definition(
+            "svc", None, None, realm="default"
+        )
+
+        assert eff1 is eff2
+        assert eff1.image == "prof-img"
+        assert base.image == "base-img"
+
 
 class TestPersistentServiceParsing:
     """Tests for parsing persistent services configurations."""
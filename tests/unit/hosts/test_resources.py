@@ -579,3 +579,71 @@ class TestInstalledGpuDrivers:
             drivers = HostResources.installed_gpu_drivers()
 
         assert drivers == []
+
+
+class TestNvidiaGpuInfo:
+    """Tests for HostResources._get_nvidia_gpu_info."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_nvml_session(self):
+        with patch("src.hosts.resources._nvml_devices", None):
+            yield
+
+    def test_nvml_initialized_once_and_memory_sampled_each_call(
+        self,
+        mock_nvidia_available,
+        mock_pynvml,
+    ):
+        """Device lookups happen once; memory is read on every call."""
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetName.return_value = b"NVIDIA GeForce RTX 3080"
+        mock_pynvml.nvmlDeviceGetPciInfo.return_value = Mock(
+            busId=b"0000:01:00.0"
+        )
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = Mock(
+            total=8 * 1024**3, free=6 * 1024**3, used=2 * 1024**3
+        )
+
+        first = HostResources._get_nvidia_gpu_info()
+        second = HostResources._get_nvidia_gpu_info()
+
+        assert first == second
+        gpus, total_gb, available_gb = second
+        assert gpus[0]["description"] == "NVIDIA GeForce RTX 3080"
+        assert gpus[0]["pci_device_description"] == "0000:01:00.0"
+        assert (total_gb, available_gb) == (8.0, 6.0)
+        mock_pynvml.nvmlInit.assert_called_once()
+        mock_pynvml.nvmlDeviceGetHandleByIndex.assert_called_once_with(0)
+        assert mock_pynvml.nvmlDeviceGetMemoryInfo.call_count == 2
+
+    def test_failure_starts_a_new_nvml_session(
+        self,
+        mock_nvidia_available,
+        mock_pynvml,
+    ):
+        """After an NVML error the next call initializes NVML again."""
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetMemoryInfo.side_effect = [
+            RuntimeError("driver gone"),
+            Mock(total=1024**3, free=1024**3, used=0),
+        ]
+
+        assert HostResources._get_nvidia_gpu_info() == ([], 0.0, 0.0)
+        gpus, _, _ = HostResources._get_nvidia_gpu_info()
+
+        assert len(gpus) == 1
+        assert mock_pynvml.nvmlInit.call_count == 2
+        mock_pynvml.nvmlShutdown.assert_called_once()
+
+    def test_failed_enumeration_shuts_nvml_down(
+        self,
+        mock_nvidia_available,
+        mock_pynvml,
+    ):
+        """An NVML session whose devices cannot be listed is not leaked."""
+        mock_pynvml.nvmlDeviceGetCount.side_effect = RuntimeError("no driver")
+
+        assert HostResources._get_nvidia_gpu_info() == ([], 0.0, 0.0)
+
+        mock_pynvml.nvmlInit.assert_called_once()
+        mock_pynvml.nvmlShutdown.assert_called_once()
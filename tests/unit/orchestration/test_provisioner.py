@@ -1,4 +1,9 @@
+import contextlib
+import ctypes
+import errno
 import os
+import threading
+import time
 import types
 from datetime import datetime, timedelta
 
@@ -25,6 +30,8 @@ class FakeActiveServicesCache:
         # Optional hook: raise once, then succeed (used by retry test)
         self.raise_write_collision_once = False
         self._raised_once = False
+        # Bumped on every write; the version token of get_snapshot()
+        self._version = 0
 
     def get_services(self) -> list[ServiceInformation]:
         return [ServiceInformation(**s.model_dump()) for s in self._services]
@@ -44,6 +51,23 @@ class FakeActiveServicesCache:
         self._services = [
             ServiceInformation(**s.model_dump()) for s in services
         ]
+        self._version += 1
+
+    @contextlib.contextmanager
+    def batch(self):
+        yield
+
+    def get_snapshot(self) -> tuple[int, list[ServiceInformation]]:
+        return self._version, self.get_services()
+
+    def compare_and_set_services(
+        self, version: int, services: list[ServiceInformation]
+    ) -> None:
+        from util.active_services_cache import SnapshotConflict
+
+        if version != self._version:
+            raise SnapshotConflict("simulated conflict")
+        self.set_services(services)
 
 
 def _svc_info(
@@ -145,6 +169,12 @@ def provisioner_env(monkeypatch, tmp_path):
 
     prov = SystemProvisioner(config_reader=config_reader, cache=cache)
 
+    # The daemon loop waits on its wake/stop events rather than sleeping;
+    # route those waits through the same loop-aborting patch
+    monkeypatch.setattr(prov._stop_event, "wait", sleep_patch)
+    monkeypatch.setattr(prov._wake_event, "wait", sleep_patch)
+    monkeypatch.setattr(prov, "_subscribe_cache_updates", lambda: None)
+
     # Expose internals for tests to seed/inspect cache
     fake_cache: FakeActiveServicesCache = prov._active_services_cache  # type: ignore[attr-defined]
 
@@ -212,6 +242,7 @@ def test_daemon_start_flow_sets_timestamps_and_persists(
     assert fake_cache.set_calls, "expected cache write"
     persisted = fake_cache.set_calls[-1][0]
     assert "start_initiated" in persisted.info
+    assert "start_initiated_epoch" in persisted.info
     assert "start_completed" in persisted.info
 
     # Lookup should have been called with our stub type value
@@ -219,6 +250,66 @@ def test_daemon_start_flow_sets_timestamps_and_persists(
     assert lookup_args["seen"][0] == "dummy-type"
 
 
+def test_daemon_tick_reads_cache_once(monkeypatch, provisioner_env):
+    prov_mod, prov, fake_cache = provisioner_env
+    fake_cache._services = [
+        _svc_info("svc1", ServiceStatus.STARTING),
+        _svc_info("svc2", ServiceStatus.STARTING),
+        _svc_info("svc3", ServiceStatus.STOPPING),
+    ]
+
+    class DummyService:
+        def __init__(self, service_info: ServiceInformation):
+            self.service_info = service_info
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(
+        prov_mod.BaseProvisionableService,
+        "_lookup_service",
+        staticmethod(lambda service_type: DummyService),
+    )
+    reads = []
+    get_services = fake_cache.get_services
+
+    def counting_get_services():
+        reads.append(True)
+        return get_services()
+
+    monkeypatch.setattr(fake_cache, "get_services", counting_get_services)
+
+    prov._handle_requests()
+
+    assert len(reads) == 1
+    persisted = {s.name: s for s in fake_cache.set_calls[-1]}
+    assert persisted["svc1"].status == ServiceStatus.AVAILABLE
+    assert persisted["svc2"].status == ServiceStatus.AVAILABLE
+    assert "svc3" not in persisted
+
+
+def test_daemon_tick_skips_settled_services(monkeypatch, provisioner_env):
+    prov_mod, prov, fake_cache = provisioner_env
+    fake_cache._services = [
+        _svc_info("svc1", ServiceStatus.AVAILABLE),
+        _svc_info("svc2", ServiceStatus.AVAILABLE),
+    ]
+
+    def fail_lookup(service_info):
+        raise AssertionError("no service should be examined")
+
+    monkeypatch.setattr(
+        prov, "_get_service_class_from_service_info", fail_lookup
+    )
+
+    prov._handle_requests()
+
+    assert not fake_cache.set_calls
+
+
 def test_daemon_ignores_duplicate_start_within_timeout(
     monkeypatch,
     provisioner_env,
@@ -252,6 +343,63 @@ def test_daemon_ignores_duplicate_start_within_timeout(
     )
 
 
+def test_service_class_is_resolved_once_per_service(
+    monkeypatch, provisioner_env
+):
+    prov_mod, prov, _ = provisioner_env
+    lookups = []
+
+    def fake_lookup(service_type: str):
+        lookups.append(service_type)
+        return object
+
+    monkeypatch.setattr(
+        prov_mod.BaseProvisionableService,
+        "_lookup_service",
+        staticmethod(fake_lookup),
+    )
+
+    for name in ("svc1", "svc2"):
+        si = _svc_info(name, ServiceStatus.STARTING)
+        assert prov._get_service_class_from_service_info(si) is object
+
+    assert lookups == ["dummy-type"]
+
+
+def test_jittered_timeout_is_stable_per_name_and_bounded():
+    from orchestration import provisioner as prov_mod
+
+    timeouts = {
+        name: prov_mod._jittered_timeout(3600.0, name)
+        for name in (f"svc{i}" for i in range(50))
+    }
+
+    assert all(3240.0 <= t <= 3960.0 for t in timeouts.values())
+    assert len(set(timeouts.values())) > 1
+    assert prov_mod._jittered_timeout(3600.0, "svc1") == timeouts["svc1"]
+
+
+def test_initiated_within_prefers_epoch_over_iso_string():
+    from orchestration.provisioner import SystemProvisioner
+
+    now = datetime.now()
+    stale = now - timedelta(hours=2)
+    info = {
+        "start_initiated": stale.isoformat(),
+        "start_initiated_epoch": now.timestamp() - 1,
+    }
+    assert SystemProvisioner._initiated_within(info, "start_initiated", now, 60)
+
+    # Entries without the epoch stamp fall back to the ISO string
+    del info["start_initiated_epoch"]
+    assert not SystemProvisioner._initiated_within(
+        info, "start_initiated", now, 60
+    )
+    assert not SystemProvisioner._initiated_within(
+        {}, "start_initiated", now, 60
+    )
+
+
 def test_daemon_stop_flow_sets_timestamps_and_persists(
     monkeypatch,
     provisioner_env,
@@ -357,6 +505,25 @@ def test_daemon_persists_with_retry_on_write_collision(
     # is recorded by our fake
 
 
+def test_backoff_delays_grow_with_jitter_up_to_cap(monkeypatch):
+    import orchestration.provisioner as prov_mod
+
+    monkeypatch.setattr(prov_mod.random, "random", lambda: 1.0)
+    delays = prov_mod._backoff_delays(initial=0.01, cap=0.05)
+    assert [round(next(delays), 3) for _ in range(5)] == [
+        0.01,
+        0.02,
+        0.04,
+        0.05,
+        0.05,
+    ]
+
+    # The jitter never drops a delay below half its nominal value
+    monkeypatch.setattr(prov_mod.random, "random", lambda: 0.0)
+    delays = prov_mod._backoff_delays(initial=0.01, cap=0.05)
+    assert next(delays) == pytest.approx(0.005)
+
+
 class TestUpdateServicesBehaviorEmptyList:
     def test_empty_list_marks_all_active_as_stopping_and_persists(
         self,
@@ -462,6 +629,36 @@ class TestRunBackendDaemonChecks:
         # Only the successful write is recorded
         assert len(fake_cache.set_calls) == 1
 
+    def test_update_reapplies_changes_after_snapshot_conflict(
+        self, provisioner_env
+    ):
+        _prov_mod, prov, fake_cache = provisioner_env
+
+        fake_cache._services = [_svc_info("a", ServiceStatus.AVAILABLE)]
+        original_get_snapshot = fake_cache.get_snapshot
+
+        def racing_get_snapshot():
+            snapshot = original_get_snapshot()
+            if not fake_cache.set_calls:
+                # Another writer lands between our read and our write
+                fake_cache.set_services(
+                    fake_cache.get_services()
+                    + [_svc_info("b", ServiceStatus.STARTING)]
+                )
+            return snapshot
+
+        fake_cache.get_snapshot = racing_get_snapshot
+
+        ok = prov.update_active_services([
+            _svc_info("a", ServiceStatus.STARTING),
+            _svc_info("b", ServiceStatus.STARTING),
+        ])
+
+        assert ok
+        # The concurrent write is kept rather than overwritten
+        assert [s.name for s in fake_cache._services] == ["a", "b"]
+        assert len(fake_cache.set_calls) == 2
+
 
 class TestInitServiceProperties:
     def test_init_service_attaches_properties(self, provisioner_env):
@@ -587,3 +784,706 @@ class TestSystemProvisionerPersistence:
 
         persisted = fake_cache.set_calls[-1]
         assert all(s.status == ServiceStatus.STOPPING for s in persisted)
+
+
+class TestStopEvent:
+    def test_stop_event_ends_daemon_loop(self, provisioner_env, monkeypatch):
+        _, prov, _ = provisioner_env
+
+        handled = []
+        monkeypatch.setattr(
+            prov, "_handle_requests", lambda: handled.append(True)
+        )
+
+        # A signal received before the loop starts means no iterations run
+        prov._stop_event.set()
+        prov.run_backend_daemon()
+
+        assert handled == []
+
+    def test_wake_event_cuts_wait_short_and_is_consumed(self):
+        from orchestration.provisioner import SystemProvisioner
+
+        prov = SystemProvisioner.__new__(SystemProvisioner)
+        prov._wake_event = threading.Event()
+
+        prov._wake_event.set()
+        started = time.monotonic()
+        prov._wait_for_work(60.0)
+        assert time.monotonic() - started < 1.0
+        assert not prov._wake_event.is_set()
+
+    def test_update_active_services_wakes_daemon_loop(self, provisioner_env):
+        _, prov, _ = provisioner_env
+
+        assert prov.update_active_services([
+            _svc_info("svc1", ServiceStatus.STARTING)
+        ])
+        assert prov._wake_event.is_set()
+
+
+class TestMountCache:
+    def test_reads_mountpoints_and_reloads_after_invalidate(
+        self, monkeypatch, tmp_path
+    ):
+        from orchestration.provisioner import _MountCache
+
+        mounts_file = tmp_path / "mounts"
+        mounts_file.write_text(
+            "proc /proc proc rw,nosuid 0 0\n"
+            "server:/export /exports/data nfs rw,vers=4.2 0 0\n"
+        )
+        monkeypatch.setattr(_MountCache, "MOUNTS_FILE", str(mounts_file))
+
+        mount_cache = _MountCache(ttl=3600.0)
+        assert mount_cache.mountpoints() == ["/exports/data", "/proc"]
+
+        # Within the TTL the table is not re-read...
+        mounts_file.write_text("proc /proc proc rw,nosuid 0 0\n")
+        assert "/exports/data" in mount_cache.mountpoints()
+
+        # ...until it is invalidated
+        mount_cache.invalidate()
+        assert mount_cache.mountpoints() == ["/proc"]
+
+    def test_mountpoints_under_returns_deepest_first(
+        self, provisioner_env, monkeypatch
+    ):
+        _, prov, _ = provisioner_env
+
+        monkeypatch.setattr(
+            prov._mount_cache,
+            "mountpoints",
+            lambda: sorted([
+                "/",
+                "/srv/enc/realm/mounts/inst",
+                "/srv/enc/realm/mounts/inst/vol",
+                "/srv/enc/realm/mounts-other",
+                "/srv/enc/realm/mountsz",
+            ]),
+        )
+
+        assert prov._mountpoints_under("/srv/enc/realm/mounts") == [
+            "/srv/enc/realm/mounts/inst/vol",
+            "/srv/enc/realm/mounts/inst",
+        ]
+
+
+class TestUnmountEncryptedVolume:
+    def test_detaches_with_umount2_without_spawning_umount(
+        self, provisioner_env, monkeypatch
+    ):
+        import pathlib
+
+        prov_mod, prov, _ = provisioner_env
+        calls = []
+
+        def fake_umount2(path, flags):
+            calls.append((path, flags))
+            return 0
+
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("umount binary should not be spawned")
+
+        monkeypatch.setattr(prov_mod, "_umount2", fake_umount2)
+        monkeypatch.setattr(prov_mod.subprocess, "run", no_subprocess)
+        invalidated = []
+        monkeypatch.setattr(
+            prov._mount_cache, "invalidate", lambda: invalidated.append(True)
+        )
+
+        assert prov._unmount_encrypted_volume(pathlib.Path("/mnt/vol"))
+        assert calls == [(b"/mnt/vol", prov_mod.MNT_DETACH)]
+        assert invalidated == [True]
+
+    def test_umount_fallback_keeps_real_failures_distinct(
+        self, provisioner_env, monkeypatch
+    ):
+        prov_mod, _, _ = provisioner_env
+        monkeypatch.setattr(prov_mod, "_umount2", None)
+
+        def fake_run(stderr):
+            return lambda *a, **k: prov_mod.subprocess.CompletedProcess(
+                a[0], 32, stdout="", stderr=stderr
+            )
+
+        monkeypatch.setattr(
+            prov_mod.subprocess, "run", fake_run("umount: /m: not mounted.")
+        )
+        assert prov_mod._lazy_unmount("/m") == errno.EINVAL
+
+        monkeypatch.setattr(
+            prov_mod.subprocess, "run", fake_run("umount: /m: target is busy.")
+        )
+        assert prov_mod._lazy_unmount("/m") == errno.EIO
+
+
+class TestIsMountpoint:
+    def test_mount_table_read_only_when_ismount_misses(
+        self, provisioner_env, monkeypatch
+    ):
+        prov_mod, prov, _ = provisioner_env
+        reads = []
+
+        def mountpoints():
+            reads.append(True)
+            return ["/srv/bind"]
+
+        monkeypatch.setattr(prov._mount_cache, "mountpoints", mountpoints)
+        monkeypatch.setattr(
+            prov_mod.os.path, "ismount", lambda path: path == "/srv/nfs"
+        )
+
+        assert prov._is_mountpoint("/srv/nfs")
+        assert reads == []
+
+        # A same-filesystem bind mount is only found in the mount table
+        assert prov._is_mountpoint("/srv/bind")
+        assert not prov._is_mountpoint("/srv/plain")
+        assert len(reads) == 2
+
+
+class TestGetLatestVolumeVersion:
+    def test_returns_greatest_matching_image(self, provisioner_env, tmp_path):
+        _, prov, _ = provisioner_env
+        prov.encrypted_storage_dir = str(tmp_path)
+        realm_root = tmp_path / "default"
+        realm_root.mkdir()
+        for name in (
+            "models.20240101.img",
+            "models.20240301.img",
+            "models.20240201.img",
+            "models.20991231.img.tmp",
+            "models-extra.20991231.img",
+            "other.20991231.img",
+        ):
+            (realm_root / name).touch()
+
+        assert (
+            prov._get_latest_volume_version("default", "models")
+            == realm_root / "models.20240301.img"
+        )
+        assert prov._get_latest_volume_version("default", "absent") is None
+        assert prov._get_latest_volume_version("missing", "models") is None
+
+
+class TestPrepareNfsMounts:
+    def test_mounts_all_volumes_and_reports_failures_together(
+        self, provisioner_env, monkeypatch, tmp_path
+    ):
+        prov_mod, prov, _ = provisioner_env
+        monkeypatch.setenv("OZWALD_NFS_MOUNTS", str(tmp_path))
+        prov.config_reader.volumes = {
+            "good": {"type": "nfs", "server": "nfs1", "path": "/a"},
+            "bad": {"type": "nfs", "server": "nfs2", "path": "/b"},
+            "local": {"type": "bind", "source": "/tmp"},
+            "mounted": {"type": "nfs", "server": "nfs3", "path": "/c"},
+        }
+        # Already-mounted volumes are found in the mount table, without
+        # touching the mountpoint itself
+        already_mounted = str(tmp_path / "mounted")
+        monkeypatch.setattr(
+            prov._mount_cache, "mountpoints", lambda: [already_mounted]
+        )
+
+        mounted = []
+
+        def fake_run(cmd, **kwargs):
+            mounted.append(cmd[-2])
+            rc = 1 if cmd[-2] == "nfs2:/b" else 0
+            return types.SimpleNamespace(
+                returncode=rc, stdout="", stderr="access denied"
+            )
+
+        monkeypatch.setattr(prov_mod, "_mount", None)
+        monkeypatch.setattr(prov_mod.subprocess, "run", fake_run)
+
+        with pytest.raises(RuntimeError, match="nfs2:/b") as exc_info:
+            prov._prepare_nfs_mounts()
+
+        assert sorted(mounted) == ["nfs1:/a", "nfs2:/b"]
+        assert "nfs1:/a" not in str(exc_info.value)
+        assert not os.path.exists(already_mounted)
+
+    def test_mounts_with_syscall_and_spawns_mount_only_on_failure(
+        self, provisioner_env, monkeypatch, tmp_path
+    ):
+        prov_mod, prov, _ = provisioner_env
+        monkeypatch.setenv("OZWALD_NFS_MOUNTS", str(tmp_path))
+        prov.config_reader.volumes = {
+            "fast": {"type": "nfs", "server": "nfs1", "path": "/a"},
+            "helper": {"type": "nfs", "server": "nfs2", "path": "/b"},
+        }
+        monkeypatch.setattr(prov._mount_cache, "mountpoints", list)
+        monkeypatch.setattr(
+            prov_mod.socket,
+            "getaddrinfo",
+            lambda host, port: [(None, None, None, "", ("10.0.0.1", 0))],
+        )
+
+        syscalls = []
+
+        def fake_mount(src, target, fstype, flags, data):
+            syscalls.append((src, fstype, data))
+            if src == b"nfs2:/b":
+                ctypes.set_errno(errno.EACCES)
+                return -1
+            return 0
+
+        spawned = []
+
+        def fake_run(cmd, **kwargs):
+            spawned.append(cmd[-2])
+            return types.SimpleNamespace(returncode=0, stdout="", stderr="")
+
+        monkeypatch.setattr(prov_mod, "_mount", fake_mount)
+        monkeypatch.setattr(prov_mod.subprocess, "run", fake_run)
+
+        prov._prepare_nfs_mounts()
+
+        assert len(syscalls) == 2
+        src, fstype, data = next(c for c in syscalls if c[0] == b"nfs1:/a")
+        assert fstype == b"nfs"
+        assert data.startswith(b"addr=10.0.0.1,")
+        assert spawned == ["nfs2:/b"]
+
+    def test_busy_mountpoint_does_not_spawn_mount(
+        self, provisioner_env, monkeypatch
+    ):
+        prov_mod, _, _ = provisioner_env
+        monkeypatch.setattr(
+            prov_mod.socket,
+            "getaddrinfo",
+            lambda host, port: [(None, None, None, "", ("10.0.0.1", 0))],
+        )
+
+        def fake_mount(src, target, fstype, flags, data):
+            ctypes.set_errno(errno.EBUSY)
+            return -1
+
+        def fake_run(cmd, **kwargs):
+            raise AssertionError("mount(8) should not be spawned")
+
+        monkeypatch.setattr(prov_mod, "_mount", fake_mount)
+        monkeypatch.setattr(prov_mod.subprocess, "run", fake_run)
+
+        error = prov_mod._mount_nfs("nfs1", "/a", "/m", "")
+
+        assert error == os.strerror(errno.EBUSY)
+
+    def test_volume_options_override_defaults(self):
+        from orchestration.provisioner import SystemProvisioner
+
+        opts = SystemProvisioner._nfs_mount_options(
+            "cto,soft,rsize=65536,vers=4.2"
+        )
+        merged = SystemProvisioner._parse_mount_options(opts)
+
+        assert merged["rsize"] == "65536"
+        assert merged["vers"] == "4.2"
+        assert merged["actimeo"] == "600"
+        assert "cto" in merged
+        assert "nocto" not in merged
+        assert "soft" in merged
+        assert "hard" not in merged
+
+    def test_dict_options_are_merged_over_defaults(self):
+        from orchestration.provisioner import SystemProvisioner
+
+        merged = SystemProvisioner._parse_mount_options(
+            SystemProvisioner._nfs_mount_options({"nconnect": 2})
+        )
+
+        assert merged["nconnect"] == "2"
+        assert merged["wsize"] == "1048576"
+
+
+class TestConfigLookupCaching:
+    def test_init_service_properties_do_not_alias_shared_definition(
+        self, provisioner_env, monkeypatch
+    ):
+        from orchestration.models import EffectiveServiceDefinition
+
+        _, prov, _ = provisioner_env
+        shared = EffectiveServiceDefinition(properties={"resolved-prop": "v"})
+        monkeypatch.setattr(
+            prov.config_reader,
+            "get_effective_service_definition",
+            lambda *args, **kwargs: shared,
+        )
+
+        si = prov._init_service(
+            _svc_info("inst1", ServiceStatus.STARTING, service_name="svc1")
+        )
+        si.properties["extra"] = "x"
+
+        assert "extra" not in shared.properties
+
+
+class TestWriteFootprintUsage:
+    @staticmethod
+    def _delta(service_name, profile=None, variety=None, cpu=1):
+        from orchestration.models import (
+            ServiceInstanceUsage,
+            SystemUsageDelta,
+        )
+
+        return SystemUsageDelta(
+            service_name=service_name,
+            profile=profile,
+            variety=variety,
+            usage=ServiceInstanceUsage(cpu_cores=cpu),
+        )
+
+    def test_missing_file_is_created(self, provisioner_env):
+        import yaml
+
+        _, prov, _ = provisioner_env
+        path = os.environ["OZWALD_FOOTPRINT_DATA"]
+
+        prov._write_footprint_usage(self._delta("svc", "p"))
+
+        with open(path) as f:
+            records = yaml.safe_load(f)
+        assert [r["service_name"] for r in records] == ["svc"]
+
+    def test_record_replaced_and_sorted_with_none_keys(self, provisioner_env):
+        import yaml
+
+        _, prov, _ = provisioner_env
+        path = os.environ["OZWALD_FOOTPRINT_DATA"]
+
+        prov._write_footprint_usage(self._delta("b", "p", "v"))
+        prov._write_footprint_usage(self._delta("a", None, None))
+        prov._write_footprint_usage(self._delta("a", "p", None))
+        prov._write_footprint_usage(self._delta("b", "p", "v", cpu=2))
+
+        with open(path) as f:
+            records = yaml.safe_load(f)
+        assert [
+            (r["service_name"], r["profile"], r["variety"]) for r in records
+        ] == [("a", None, None), ("a", "p", None), ("b", "p", "v")]
+        assert records[2]["usage"]["cpu_cores"] == 2
+
+    def test_unchanged_record_does_not_rewrite_file(self, provisioner_env):
+        _, prov, _ = provisioner_env
+        path = os.environ["OZWALD_FOOTPRINT_DATA"]
+
+        prov._write_footprint_usage(self._delta("a", "p"))
+        mtime = os.stat(path).st_mtime_ns
+        os.utime(path, ns=(mtime, mtime - 1000))
+
+        prov._write_footprint_usage(self._delta("a", "p"))
+        assert os.stat(path).st_mtime_ns == mtime - 1000
+
+        prov._write_footprint_usage(self._delta("a", "p", cpu=3))
+        assert os.stat(path).st_mtime_ns != mtime - 1000
+
+    def test_batch_writes_file_once_on_exit(self, provisioner_env):
+        import yaml
+
+        _, prov, _ = provisioner_env
+        path = os.environ["OZWALD_FOOTPRINT_DATA"]
+
+        with prov._footprint_usage_batch():
+            prov._write_footprint_usage(self._delta("b"))
+            prov._write_footprint_usage(self._delta("a"))
+            assert not os.path.exists(path)
+
+        with open(path) as f:
+            records = yaml.safe_load(f)
+        assert [r["service_name"] for r in records] == ["a", "b"]
+
+    def test_file_parsed_once_unless_changed_externally(
+        self, provisioner_env, monkeypatch
+    ):
+        import yaml
+
+        prov_mod, prov, _ = provisioner_env
+        path = os.environ["OZWALD_FOOTPRINT_DATA"]
+        loads = []
+        load = yaml.load
+        safe_load = yaml.safe_load
+
+        def counting_load(stream, Loader):
+            loads.append(stream)
+            return load(stream, Loader=Loader)
+
+        monkeypatch.setattr(prov_mod.yaml, "load", counting_load)
+
+        prov._write_footprint_usage(self._delta("a"))
+        prov._write_footprint_usage(self._delta("b"))
+        assert loads == []
+
+        # Another writer replaces the file; the index is rebuilt from it
+        with open(path, "w") as f:
+            yaml.safe_dump([self._delta("c").model_dump()], f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        prov._write_footprint_usage(self._delta("d"))
+        assert len(loads) == 1
+        with open(path) as f:
+            records = safe_load(f)
+        assert [r["service_name"] for r in records] == ["c", "d"]
+
+
+class TestHandleFootprintRequest:
+    def test_duplicate_targets_are_footprinted_once(
+        self, provisioner_env, monkeypatch
+    ):
+        from orchestration.models import (
+            ConfiguredServiceIdentifier,
+            FootprintAction,
+        )
+
+        _, prov, _ = provisioner_env
+
+        class StubFootprintRequestCache:
+            def update_footprint_request(self, request):
+                pass
+
+            def get_requests(self):
+                return []
+
+            def set_requests(self, requests):
+                pass
+
+        prov._footprint_request_cache = StubFootprintRequestCache()
+        footprinted = []
+        monkeypatch.setattr(
+            prov,
+            "_footprint_single_service",
+            lambda target: footprinted.append(target.service_name),
+        )
+
+        request = FootprintAction(
+            request_id="req-1",
+            services=[
+                ConfiguredServiceIdentifier(service_name="a", profile="p"),
+                ConfiguredServiceIdentifier(service_name="b"),
+                ConfiguredServiceIdentifier(service_name="a", profile="p"),
+            ],
+        )
+        prov._handle_footprint_request(request)
+
+        assert footprinted == ["a", "b"]
+
+    def test_removal_skips_write_when_request_already_gone(
+        self, provisioner_env
+    ):
+        from orchestration.models import FootprintAction
+
+        _, prov, _ = provisioner_env
+        writes = []
+        other = FootprintAction(request_id="req-2", services=[])
+
+        class StubFootprintRequestCache:
+            def update_footprint_request(self, request):
+                pass
+
+            def get_requests(self):
+                return [other]
+
+            def set_requests(self, requests):
+                writes.append(requests)
+
+        prov._footprint_request_cache = StubFootprintRequestCache()
+        prov._handle_footprint_request(
+            FootprintAction(request_id="req-1", services=[])
+        )
+
+        assert writes == []
+
+    def test_shutdown_leaves_request_for_retry(
+        self, provisioner_env, monkeypatch
+    ):
+        from orchestration.models import (
+            ConfiguredServiceIdentifier,
+            FootprintAction,
+        )
+
+        _, prov, _ = provisioner_env
+        writes = []
+        request = FootprintAction(
+            request_id="req-1",
+            services=[
+                ConfiguredServiceIdentifier(service_name="a"),
+                ConfiguredServiceIdentifier(service_name="b"),
+            ],
+        )
+
+        class StubFootprintRequestCache:
+            def update_footprint_request(self, request):
+                pass
+
+            def get_requests(self):
+                return [request]
+
+            def set_requests(self, requests):
+                writes.append(requests)
+
+        prov._footprint_request_cache = StubFootprintRequestCache()
+        footprinted = []
+
+        def footprint_then_shut_down(target):
+            footprinted.append(target.service_name)
+            prov._stop_event.set()
+
+        monkeypatch.setattr(
+            prov, "_footprint_single_service", footprint_then_shut_down
+        )
+
+        prov._handle_footprint_request(request)
+
+        assert footprinted == ["a"]
+        assert writes == []
+
+
+class TestFootprintSingleService:
+    def test_completed_start_and_stop_do_not_wait_on_cache(
+        self, provisioner_env, monkeypatch
+    ):
+        from orchestration.models import ConfiguredServiceIdentifier
+
+        prov_mod, prov, fake_cache = provisioner_env
+        calls = []
+
+        class DummyService:
+            def __init__(self, service_info: ServiceInformation):
+                self.service_info = service_info
+
+            def start(self):
+                calls.append("start")
+
+            def stop(self):
+                calls.append("stop")
+
+        monkeypatch.setattr(
+            prov_mod.BaseProvisionableService,
+            "_lookup_service",
+            staticmethod(lambda service_type: DummyService),
+        )
+        host = types.SimpleNamespace(
+            available_cpu_cores=4, available_ram_gb=8.0, available_vram_gb=0.0
+        )
+        monkeypatch.setattr(
+            prov_mod.HostResources, "inspect_host", staticmethod(lambda: host)
+        )
+        monkeypatch.setattr(
+            prov.config_reader,
+            "get_effective_service_definition",
+            lambda *args, **kwargs: types.SimpleNamespace(
+                footprint=types.SimpleNamespace(run_time=0),
+                properties={},
+                volumes=[],
+            ),
+        )
+
+        def no_wait(*args, **kwargs):
+            raise AssertionError("completed markers should not be waited on")
+
+        monkeypatch.setattr(prov, "_wait_for_start_completed", no_wait)
+        monkeypatch.setattr(prov, "_wait_for_stop_completed", no_wait)
+
+        prov._footprint_single_service(
+            ConfiguredServiceIdentifier(service_name="svcdef")
+        )
+
+        assert calls == ["start", "stop"]
+        assert fake_cache._services == []
+
+    def test_shutdown_during_run_stops_service_without_writing_usage(
+        self, provisioner_env, monkeypatch
+    ):
+        from orchestration.models import ConfiguredServiceIdentifier
+
+        prov_mod, prov, fake_cache = provisioner_env
+        calls = []
+
+        class DummyService:
+            def __init__(self, service_info: ServiceInformation):
+                self.service_info = service_info
+
+            def start(self):
+                calls.append("start")
+
+            def stop(self):
+                calls.append("stop")
+
+        monkeypatch.setattr(
+            prov_mod.BaseProvisionableService,
+            "_lookup_service",
+            staticmethod(lambda service_type: DummyService),
+        )
+        host = types.SimpleNamespace(
+            available_cpu_cores=4, available_ram_gb=8.0, available_vram_gb=0.0
+        )
+        monkeypatch.setattr(
+            prov_mod.HostResources, "inspect_host", staticmethod(lambda: host)
+        )
+        monkeypatch.setattr(
+            prov.config_reader,
+            "get_effective_service_definition",
+            lambda *args, **kwargs: types.SimpleNamespace(
+                footprint=types.SimpleNamespace(run_time=600),
+                properties={},
+                volumes=[],
+            ),
+        )
+        writes = []
+        monkeypatch.setattr(prov, "_write_footprint_usage", writes.append)
+        # A shutdown signal has already arrived, so the run-time wait
+        # returns at once
+        prov._stop_event.set()
+        monkeypatch.setattr(prov._stop_event, "wait", lambda timeout=None: True)
+
+        prov._footprint_single_service(
+            ConfiguredServiceIdentifier(service_name="svcdef")
+        )
+
+        assert writes == []
+        assert calls == ["start", "stop"]
+        assert fake_cache._services == []
+
+
+class TestSingleton:
+    def test_concurrent_callers_share_one_instance(self, monkeypatch):
+        import orchestration.provisioner as prov_mod
+
+        monkeypatch.setattr(prov_mod, "_system_provisioner", None)
+        built = []
+        release = threading.Event()
+
+        class SlowProvisioner(prov_mod.SystemProvisioner):
+            def __init__(self, config_reader, cache):
+                built.append(self)
+                # Hold the constructor open so every caller races for it
+                release.wait(5)
+
+            def _prepare_nfs_mounts(self):
+                pass
+
+        monkeypatch.setattr(
+            prov_mod.SystemConfigReader, "singleton", staticmethod(lambda: None)
+        )
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    SlowProvisioner.singleton(
+                        cache=Cache(type="memory", parameters={})
+                    )
+                )
+            )
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        assert len(built) == 1
+        assert len(results) == 4
+        assert all(r is built[0] for r in results)
@@ -162,7 +162,7 @@ class TestBaseProvisionableServiceLifecycle:
                 self.stdout = stdout
                 self.stderr = stderr
 
-        def fake_run(cmd, capture_output=False, text=False, check=False):
+        def fake_run(cmd, check=False, **kwargs):
             # Distinguish by first two args
             cmd_str = " ".join(cmd)
             if cmd[:3] == ["docker", "rm", "-f"]:
@@ -170,11 +170,9 @@ class TestBaseProvisionableServiceLifecycle:
             if cmd[:2] == ["docker", "run"]:
                 # return container id
                 return CP(0, stdout="abc123\n")
-            if "inspect" in cmd_str and ".Id" in cmd_str:
-                return CP(0, stdout="abc123\n")
             if "inspect" in cmd_str and ".State.Status" in cmd_str:
                 # indicate running and healthy
-                return CP(0, stdout="running true healthy\n")
+                return CP(0, stdout="abc123 running true healthy\n")
             if cmd[:2] == ["docker", "inspect"]:
                 # indicate running
                 return CP(0, stdout="true\n")
@@ -188,6 +186,8 @@ class TestBaseProvisionableServiceLifecycle:
                 self.stdout = MagicMock()
                 self.stdout.readline.return_value = ""
                 self.poll = lambda: None  # Simulate running
+                self.terminate = lambda: None
+                self.wait = lambda: 0
                 self.returncode = 0
 
         monkeypatch.setattr(
@@ -223,7 +223,7 @@ class TestBaseProvisionableServiceLifecycle:
 
         run_calls = []
 
-        def fake_run(cmd, capture_output=False, text=False, check=False):
+        def fake_run(cmd, check=False, **kwargs):
             run_calls.append(cmd)
             if cmd[:2] == ["docker", "rm", "-f"]:
                 return CP(0, stdout="")
@@ -367,28 +367,16 @@ class TestEffectiveConfigResolution:
         from config import reader as reader_mod
         from config.reader import ConfigReader
 
-        class DummyReader:
+        class DummyReader(ConfigReader):
+            # Skips ConfigReader.__init__ (no config file), setting up only
+            # the state get_effective_service_definition() relies on
             def __init__(self, svc_def):
                 self._svc = svc_def
+                self._effective_defs = {}
 
             def get_service_by_name(self, name: str, realm: str):
                 return self._svc
 
-            def get_effective_service_definition(
-                self,
-                service,
-                profile,
-                variety,
-                realm=None,
-            ):
-                return ConfigReader.get_effective_service_definition(
-                    self,
-                    service,
-                    profile,
-                    variety,
-                    realm=realm,
-                )
-
         svc_def = self._build_service_def()
         dummy = DummyReader(svc_def)
         monkeypatch.setattr(
@@ -1,4 +1,5 @@
 import os
+import queue
 import threading
 import time
 from typing import List
@@ -110,6 +111,8 @@ class TestContainerServiceHealth:
                 self.stdout = MagicMock()
                 self.stdout.readline.return_value = ""
                 self.poll = lambda: None
+                self.terminate = lambda: None
+                self.wait = lambda: 0
                 self.returncode = 0
 
         monkeypatch.setattr(
@@ -154,7 +157,7 @@ class TestContainerServiceHealth:
 
         inspect_calls = []
 
-        def fake_run(cmd, capture_output=False, text=False, check=False):
+        def fake_run(cmd, check=False, **kwargs):
             cmd_str = " ".join(cmd)
             if cmd[:3] == ["docker", "rm", "-f"]:
                 return CP(0)
@@ -162,16 +165,14 @@ class TestContainerServiceHealth:
                 return CP(0, stdout="")
             if cmd[:2] == ["docker", "run"]:
                 return CP(0, stdout="abc123\n")
-            if "inspect" in cmd_str and ".Id" in cmd_str:
-                return CP(0, stdout="abc123\n")
             if "inspect" in cmd_str and ".State.Status" in cmd_str:
                 inspect_calls.append(cmd)
                 # First two calls return "starting", third returns "healthy"
                 if len(inspect_calls) == 1:
-                    return CP(0, stdout="running true starting\n")
+                    return CP(0, stdout="abc123 running true starting\n")
                 if len(inspect_calls) == 2:
-                    return CP(0, stdout="running true starting\n")
-                return CP(0, stdout="running true healthy\n")
+                    return CP(0, stdout="abc123 running true starting\n")
+                return CP(0, stdout="abc123 running true healthy\n")
             raise AssertionError(f"Unexpected command: {cmd}")
 
         monkeypatch.setattr(cont_mod.subprocess, "run", fake_run)
@@ -197,7 +198,7 @@ class TestContainerServiceHealth:
                 self.stdout = stdout
                 self.stderr = stderr
 
-        def fake_run(cmd, capture_output=False, text=False, check=False):
+        def fake_run(cmd, check=False, **kwargs):
             cmd_str = " ".join(cmd)
             if cmd[:3] == ["docker", "rm", "-f"]:
                 return CP(0)
@@ -205,11 +206,9 @@ class TestContainerServiceHealth:
                 return CP(0, stdout="")
             if cmd[:2] == ["docker", "run"]:
                 return CP(0, stdout="abc123\n")
-            if "inspect" in cmd_str and ".Id" in cmd_str:
-                return CP(0, stdout="abc123\n")
             if "inspect" in cmd_str and ".State.Status" in cmd_str:
                 # Returns "true none" because no healthcheck defined
-                return CP(0, stdout="running true none\n")
+                return CP(0, stdout="abc123 running true none\n")
             raise AssertionError(f"Unexpected command: {cmd}")
 
         monkeypatch.setattr(cont_mod.subprocess, "run", fake_run)
@@ -221,6 +220,64 @@ class TestContainerServiceHealth:
         assert si.info.get("container_status") == "running"
         assert "container_health" not in si.info
 
+    def test_start_inspects_on_container_events(self, monkeypatch):
+        svc = FakeContainerService(_si("svc1", ServiceStatus.STARTING))
+
+        import services.container as cont_mod
+
+        class CP:
+            def __init__(self, returncode=0, stdout="", stderr=""):
+                self.returncode = returncode
+                self.stdout = stdout
+                self.stderr = stderr
+
+        class EventsProcess:
+            def __init__(self):
+                self.stdout = iter(["health_status: healthy\n"])
+                self.terminated = False
+
+            def terminate(self):
+                self.terminated = True
+
+            def wait(self):
+                return 0
+
+        events_proc = EventsProcess()
+        docker_run_popen = cont_mod.subprocess.Popen
+
+        def fake_popen(cmd, *a, **k):
+            if cmd[:2] == ["docker", "events"]:
+                return events_proc
+            return docker_run_popen(cmd, *a, **k)
+
+        inspect_calls = []
+
+        def fake_run(cmd, check=False, **kwargs):
+            if cmd[:3] == ["docker", "rm", "-f"]:
+                return CP(0)
+            if cmd[:2] == ["docker", "inspect"]:
+                inspect_calls.append(cmd)
+                if len(inspect_calls) == 1:
+                    return CP(0, stdout="abc123 running true starting\n")
+                return CP(0, stdout="abc123 running true healthy\n")
+            raise AssertionError(f"Unexpected command: {cmd}")
+
+        sleeps = []
+        monkeypatch.setattr(cont_mod.subprocess, "Popen", fake_popen)
+        monkeypatch.setattr(cont_mod.subprocess, "run", fake_run)
+        monkeypatch.setattr(time, "sleep", sleeps.append)
+
+        svc.start()
+
+        # One inspect up front and one for the health_status event, with
+        # no polling sleeps beyond the initial start grace period
+        assert len(inspect_calls) == 2
+        assert sleeps == [1]
+        assert events_proc.terminated
+        si = svc.get_service_information()
+        assert si.info.get("container_id") == "abc123"
+        assert si.info.get("container_health") == "healthy"
+
 
 class TestContainerServiceNetworks:
     @pytest.fixture(autouse=True)
@@ -236,6 +293,8 @@ class TestContainerServiceNetworks:
                 self.stdout = MagicMock()
                 self.stdout.readline.return_value = ""
                 self.poll = lambda: None
+                self.terminate = lambda: None
+                self.wait = lambda: 0
                 self.returncode = 0
 
         monkeypatch.setattr(
@@ -306,15 +365,13 @@ class TestContainerServiceNetworks:
 
         run_calls = []
 
-        def fake_run(cmd, capture_output=False, text=False, check=False):
+        def fake_run(cmd, check=False, **kwargs):
             run_calls.append(cmd)
             cmd_str = " ".join(cmd)
             if cmd[:3] == ["docker", "rm", "-f"]:
                 return CP(0)
-            if "inspect" in cmd_str and ".Id" in cmd_str:
-                return CP(0, stdout="abc123\n")
             if "inspect" in cmd_str and ".State.Status" in cmd_str:
-                return CP(0, stdout="running true healthy\n")
+                return CP(0, stdout="abc123 running true healthy\n")
             if cmd[:3] == ["docker", "network", "connect"]:
                 return CP(0)
             raise AssertionError(f"Unexpected command: {cmd}")
@@ -485,6 +542,49 @@ class TestContainerServiceEffectiveFields:
         assert eff.footprint.run_time == 60
         assert eff.footprint.run_script == "var.sh"
 
+    def test_unresolvable_definition_falls_back_once(
+        self, monkeypatch, mocker, caplog
+    ):
+        """An undefined service yields the accessors' defaults; resolution
+        is attempted, and logged, only once.
+        """
+        monkeypatch.setenv("OZWALD_HOST", "localhost")
+        mocker.patch("orchestration.provisioner.SystemProvisioner.singleton")
+        cs = ContainerService(ServiceInformation(name="svc1", service="gone"))
+        attempts = []
+
+        def undefined(self):
+            attempts.append(True)
+            raise ValueError("Service 'gone' not found")
+
+        monkeypatch.setattr(
+            ContainerService, "effective_definition", property(undefined)
+        )
+
+        with caplog.at_level("WARNING"):
+            assert cs.get_container_image() == ""
+            assert cs.get_effective_depends_on() == []
+            assert cs.get_effective_command() is None
+
+        assert len(attempts) == 1
+        assert caplog.text.count("Cannot resolve effective definition") == 1
+
+    def test_unexpected_resolution_errors_propagate(self, monkeypatch, mocker):
+        """Errors other than a missing definition are not swallowed."""
+        monkeypatch.setenv("OZWALD_HOST", "localhost")
+        mocker.patch("orchestration.provisioner.SystemProvisioner.singleton")
+        cs = ContainerService(ServiceInformation(name="svc1", service="s"))
+
+        def broken(self):
+            raise RuntimeError("config unreadable")
+
+        monkeypatch.setattr(
+            ContainerService, "effective_definition", property(broken)
+        )
+
+        with pytest.raises(RuntimeError):
+            cs.get_container_image()
+
 
 class TestContainerServiceLifecycle:
     @pytest.fixture
@@ -654,3 +754,99 @@ class TestContainerSecrets:
         container_service._service_info.secrets_tokens = {}
         path = container_service._prepare_secrets_env_file()
         assert path is None
+
+
+# ============================================================================
+# GPU Options Tests
+# ============================================================================
+
+
+class TestContainerGpuOptions:
+    @pytest.fixture
+    def container_service(self, mocker, monkeypatch):
+        monkeypatch.setenv("OZWALD_HOST", "test-host")
+        mocker.patch("orchestration.provisioner.SystemProvisioner.singleton")
+        monkeypatch.setattr(ContainerService, "_gpu_drivers", None)
+        return ContainerService(
+            ServiceInformation(name="n1", service="s1"),
+            container_environment={"GPU": "true"},
+        )
+
+    def test_gpu_drivers_are_probed_once_found(self, container_service, mocker):
+        probe = mocker.patch(
+            "services.container.HostResources.installed_gpu_drivers",
+            return_value=["nvidia"],
+        )
+
+        assert container_service.get_container_options__gpu() == [
+            "--gpus",
+            "all",
+        ]
+        assert container_service.get_container_options__gpu() == [
+            "--gpus",
+            "all",
+        ]
+        probe.assert_called_once()
+
+    def test_gpu_drivers_are_reprobed_while_none_found(
+        self, container_service, mocker
+    ):
+        probe = mocker.patch(
+            "services.container.HostResources.installed_gpu_drivers",
+            side_effect=[[], ["amdgpu"]],
+        )
+
+        assert container_service.get_container_options__gpu() == []
+        opts = container_service.get_container_options__gpu()
+        assert opts[:2] == ["--device", "/dev/kfd"]
+        assert probe.call_count == 2
+
+
+# ============================================================================
+# Log Batching Tests
+# ============================================================================
+
+
+class TestDrainLogBatches:
+    def test_lines_are_written_in_full_batches_then_remainder(self):
+        from services.container import LOG_BATCH_MAX_LINES, _drain_log_batches
+
+        lines = queue.Queue()
+        for i in range(2 * LOG_BATCH_MAX_LINES + 2):
+            lines.put(f"line {i}")
+        lines.put(None)
+
+        batches = []
+        _drain_log_batches(lines, batches.append)
+
+        assert [len(b) for b in batches] == [
+            LOG_BATCH_MAX_LINES,
+            LOG_BATCH_MAX_LINES,
+            2,
+        ]
+        assert batches[0][0] == "line 0"
+        assert batches[-1][-1] == f"line {2 * LOG_BATCH_MAX_LINES + 1}"
+
+    def test_partial_batch_is_written_when_output_goes_quiet(self):
+        from services.container import _drain_log_batches
+
+        lines = queue.Queue()
+        written = threading.Event()
+        batches = []
+
+        def write(batch):
+            batches.append(batch)
+            written.set()
+
+        drainer = threading.Thread(
+            target=_drain_log_batches, args=(lines, write)
+        )
+        drainer.start()
+        lines.put("only line")
+
+        # Flushed on the batch delay, before the stream ends
+        assert written.wait(timeout=5)
+        lines.put(None)
+        drainer.join(timeout=5)
+
+        assert batches == [["only line"]]
@@ -15,7 +15,12 @@ import json
 import pytest
 
 from src.orchestration.models import Cache, ServiceInformation, ServiceStatus
-from src.util.active_services_cache import ActiveServicesCache, WriteCollision
+from src.util.active_services_cache import (
+    BATCH_FLUSH_MAX_ATTEMPTS,
+    ActiveServicesCache,
+    SnapshotConflict,
+    WriteCollision,
+)
 
 
 @pytest.fixture
@@ -246,3 +251,274 @@ class TestGetServices:
         assert [s.model_dump() for s in result] == [
             s.model_dump() for s in services
         ]
+
+
+class TestUpdateNotification:
+    """Generation counter and `wait_for_update` signalling."""
+
+    def test_set_services_advances_generation(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """A successful write bumps the generation and wakes waiters."""
+        lock = redis_mock.return_value.lock.return_value
+        lock.acquire.return_value = True
+
+        generation = active_cache_default.generation
+        active_cache_default.set_services([])
+
+        assert active_cache_default.generation == generation + 1
+        assert active_cache_default.wait_for_update(generation, timeout=0)
+
+    def test_wait_for_update_times_out_without_write(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """Without a write, waiting returns False once the timeout expires."""
+        generation = active_cache_default.generation
+
+        assert not active_cache_default.wait_for_update(
+            generation,
+            timeout=0.01,
+        )
+
+    def test_write_collision_does_not_advance_generation(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """A failed write leaves the generation unchanged."""
+        lock = redis_mock.return_value.lock.return_value
+        lock.acquire.return_value = False
+
+        generation = active_cache_default.generation
+        with pytest.raises(WriteCollision):
+            active_cache_default.set_services([])
+
+        assert active_cache_default.generation == generation
+
+
+class TestBatch:
+    """Coalescing of writes made inside `batch()`."""
+
+    def test_writes_in_batch_are_coalesced_into_last_value(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """Only the final value is written, once, when the block exits,
+        as a compare-and-set against the value read on entry.
+        """
+        redis_client = redis_mock.return_value
+        redis_client.get.return_value = "[]"
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.get.return_value = "[]"
+        first = ServiceInformation(
+            name="svc1", service="svcA", status=ServiceStatus.STARTING
+        )
+        second = ServiceInformation(
+            name="svc1", service="svcA", status=ServiceStatus.AVAILABLE
+        )
+
+        with active_cache_default.batch():
+            active_cache_default.set_services([first])
+            active_cache_default.set_services([second])
+            pipe.set.assert_not_called()
+
+        pipe.set.assert_called_once()
+        key, stored_json = pipe.set.call_args.args
+        assert key == active_cache_default.CACHE_KEY
+        assert json.loads(stored_json)[0]["status"] == "available"
+        redis_client.set.assert_not_called()
+
+    def test_reads_in_batch_see_pending_write(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """get_services() inside the block returns the deferred value
+        without going back to Redis.
+        """
+        redis_client = redis_mock.return_value
+        redis_client.get.return_value = "[]"
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.get.return_value = "[]"
+        service = ServiceInformation(name="svc1", service="svcA")
+
+        with active_cache_default.batch():
+            active_cache_default.set_services([service])
+            redis_client.get.reset_mock()
+            result = active_cache_default.get_services()
+
+        redis_client.get.assert_not_called()
+        assert [s.name for s in result] == ["svc1"]
+
+    def test_batch_without_writes_does_not_write(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """An empty block leaves Redis untouched."""
+        with active_cache_default.batch():
+            pass
+
+        redis_client = redis_mock.return_value
+        redis_client.set.assert_not_called()
+        redis_client.pipeline.assert_not_called()
+
+    def test_batch_that_raises_does_not_write(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """A block that raises drops its deferred value."""
+        redis_client = redis_mock.return_value
+        redis_client.get.return_value = "[]"
+        service = ServiceInformation(name="svc1", service="svcA")
+
+        def write_then_fail():
+            with active_cache_default.batch():
+                active_cache_default.set_services([service])
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_then_fail()
+
+        redis_client.set.assert_not_called()
+        redis_client.pipeline.assert_not_called()
+        assert active_cache_default.get_services() == []
+
+    def test_conflicting_write_is_merged_and_retried(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+        mocker,
+    ):
+        """A write that landed during the block is kept; the block's own
+        additions, changes and removals are re-applied on top of it.
+        """
+        mocker.patch("src.util.active_services_cache.time.sleep")
+        redis_client = redis_mock.return_value
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        base = json.dumps([
+            {"name": "kept", "service": "svcA"},
+            {"name": "gone", "service": "svcA"},
+        ])
+        theirs = json.dumps([
+            {"name": "kept", "service": "svcA"},
+            {"name": "gone", "service": "svcA"},
+            {"name": "theirs", "service": "svcB"},
+        ])
+        redis_client.get.side_effect = [base, base, theirs]
+        pipe.get.side_effect = [theirs, theirs]
+
+        with active_cache_default.batch():
+            services = active_cache_default.get_services()
+            active_cache_default.set_services([
+                services[0],
+                ServiceInformation(name="ours", service="svcC"),
+            ])
+
+        assert pipe.execute.call_count == 1
+        _, stored_json = pipe.set.call_args.args
+        assert [s["name"] for s in json.loads(stored_json)] == [
+            "kept",
+            "theirs",
+            "ours",
+        ]
+        assert active_cache_default.generation == 1
+
+    def test_gives_up_when_cache_keeps_changing(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+        mocker,
+    ):
+        """The flush raises `SnapshotConflict` once its retries run out."""
+        mocker.patch("src.util.active_services_cache.time.sleep")
+        redis_client = redis_mock.return_value
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        redis_client.get.return_value = "[]"
+        pipe.get.return_value = '[{"name": "other", "service": "svcA"}]'
+
+        def write():
+            with active_cache_default.batch():
+                active_cache_default.set_services([])
+
+        with pytest.raises(SnapshotConflict):
+            write()
+
+        assert pipe.watch.call_count == BATCH_FLUSH_MAX_ATTEMPTS
+        pipe.execute.assert_not_called()
+
+
+class TestCompareAndSet:
+    """Optimistic writes made with `compare_and_set_services()`."""
+
+    def test_writes_when_snapshot_is_current(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """The write goes through a WATCHed transaction, without taking the
+        cache lock, and bumps the generation.
+        """
+        redis_client = redis_mock.return_value
+        redis_client.get.return_value = "[]"
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.get.return_value = "[]"
+        service = ServiceInformation(name="svc1", service="svcA")
+
+        version, services = active_cache_default.get_snapshot()
+        active_cache_default.compare_and_set_services(
+            version, services + [service]
+        )
+
+        assert services == []
+        pipe.watch.assert_called_once_with(active_cache_default.CACHE_KEY)
+        key, stored_json = pipe.set.call_args.args
+        assert key == active_cache_default.CACHE_KEY
+        assert json.loads(stored_json)[0]["name"] == "svc1"
+        pipe.execute.assert_called_once()
+        redis_client.lock.assert_not_called()
+        assert active_cache_default.generation == 1
+
+    def test_raises_conflict_when_cache_changed(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """A write based on a stale snapshot raises `SnapshotConflict`
+        (a `WriteCollision`) and writes nothing.
+        """
+        redis_client = redis_mock.return_value
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.get.return_value = '[{"name": "other", "service": "svcA"}]'
+
+        with pytest.raises(WriteCollision):
+            active_cache_default.compare_and_set_services("[]", [])
+
+        pipe.set.assert_not_called()
+        pipe.execute.assert_not_called()
+
+    def test_raises_conflict_when_transaction_is_aborted(
+        self,
+        active_cache_default: ActiveServicesCache,
+        redis_mock,
+    ):
+        """A write landing between the check and EXEC aborts the
+        transaction, which surfaces as `SnapshotConflict`.
+        """
+        from redis.exceptions import WatchError
+
+        redis_client = redis_mock.return_value
+        pipe = redis_client.pipeline.return_value.__enter__.return_value
+        pipe.get.return_value = None
+        pipe.execute.side_effect = WatchError("watched key changed")
+
+        with pytest.raises(SnapshotConflict):
+            active_cache_default.compare_and_set_services(None, [])
+
+        assert active_cache_default.generation == 0
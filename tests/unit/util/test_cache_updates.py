@@ -0,0 +1,49 @@
+import pytest
+import redis
+
+from orchestration.models import Cache
+from util.cache_updates import (
+    CACHE_UPDATES_CHANNEL,
+    CacheUpdateSubscriber,
+    publish_cache_update,
+)
+
+
+class TestPublishCacheUpdate:
+    def test_publishes_key_on_channel(self, mocker):
+        client = mocker.Mock(spec=redis.Redis)
+
+        publish_cache_update(client, "active_services")
+
+        client.publish.assert_called_once_with(
+            CACHE_UPDATES_CHANNEL, "active_services"
+        )
+
+    def test_publish_failure_is_not_raised(self, mocker):
+        client = mocker.Mock(spec=redis.Redis)
+        client.publish.side_effect = redis.exceptions.ConnectionError("down")
+
+        publish_cache_update(client, "active_services")
+
+
+class TestCacheUpdateSubscriber:
+    @pytest.fixture
+    def mock_redis(self, mocker):
+        mock_client = mocker.Mock(spec=redis.Redis)
+        mocker.patch("redis.Redis", return_value=mock_client)
+        return mock_client
+
+    def test_start_subscribes_and_forwards_keys(self, mock_redis):
+        pubsub = mock_redis.pubsub.return_value
+        subscriber = CacheUpdateSubscriber(Cache(type="redis", parameters={}))
+        received = []
+
+        subscriber.start(received.append)
+
+        handler = pubsub.subscribe.call_args.kwargs[CACHE_UPDATES_CHANNEL]
+        handler({"type": "message", "data": "footprint_requests"})
+        assert received == ["footprint_requests"]
+        pubsub.run_in_thread.assert_called_once()
+
+        subscriber.stop()
+        pubsub.run_in_thread.return_value.stop.assert_called_once()
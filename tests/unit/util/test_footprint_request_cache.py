@@ -7,6 +7,7 @@ from orchestration.models import (
     Cache,
     FootprintAction,
 )
+from util.cache_updates import CACHE_UPDATES_CHANNEL
 from util.footprint_request_cache import FootprintRequestCache, WriteCollision
 
 
@@ -45,6 +46,9 @@ class TestFootprintRequestCache:
         assert len(data) == 1
         assert data[0]["request_id"] == "1"
         mock_lock.release.assert_called_once()
+        mock_redis.publish.assert_called_once_with(
+            CACHE_UPDATES_CHANNEL, FootprintRequestCache.CACHE_KEY
+        )
 
     def test_set_requests_lock_collision(
         self,